@@ -6,7 +6,7 @@ import textwrap
 import tomllib
 from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, NoReturn
+from typing import TYPE_CHECKING, Any, Final, NoReturn
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -17,7 +17,13 @@ INI_USAGE = """
 [mypy.plugins.django-stubs]
 django_settings_module = str (default: `os.getenv("DJANGO_SETTINGS_MODULE")`)
 strict_settings = bool (default: true)
+settings_type_snapshot = bool (default: false)
+settings_types_module = str (default: none)
 strict_model_abstract_attrs = bool (default: true)
+schema_snapshot = bool (default: false)
+report = bool (default: false)
+profile = bool (default: false)
+lookup_cache_size = int (default: 4096)
 ...
 """
 TOML_USAGE = """
@@ -26,7 +32,13 @@ TOML_USAGE = """
 [tool.django-stubs]
 django_settings_module = str (default: `os.getenv("DJANGO_SETTINGS_MODULE")`)
 strict_settings = bool (default: true)
+settings_type_snapshot = bool (default: false)
+settings_types_module = str (default: none)
 strict_model_abstract_attrs = bool (default: true)
+schema_snapshot = bool (default: false)
+report = bool (default: false)
+profile = bool (default: false)
+lookup_cache_size = int (default: 4096)
 ...
 """
 INVALID_FILE = "mypy config file is not specified or found"
@@ -37,7 +49,10 @@ MISSING_DJANGO_SETTINGS = (
     "missing required 'django_settings_module' config.\n"
     f"Either specify this config or set your `{DJANGO_SETTINGS_ENV_VAR}` env var"
 )
+INVALID_STR_SETTING = "invalid {key!r}: the setting must be a string"
 INVALID_BOOL_SETTING = "invalid {key!r}: the setting must be a boolean"
+INVALID_SIZE_SETTING = "invalid {key!r}: the setting must be a non-negative integer"
+DEFAULT_LOOKUP_CACHE_SIZE: Final = 4096
 
 
 def exit_with_error(msg: str, is_toml: bool = False) -> NoReturn:
@@ -57,10 +72,26 @@ def exit_with_error(msg: str, is_toml: bool = False) -> NoReturn:
 
 
 class DjangoPluginConfig:
-    __slots__ = ("django_settings_module", "strict_model_abstract_attrs", "strict_settings")
+    __slots__ = (
+        "django_settings_module",
+        "lookup_cache_size",
+        "profile",
+        "report",
+        "schema_snapshot",
+        "settings_type_snapshot",
+        "settings_types_module",
+        "strict_model_abstract_attrs",
+        "strict_settings",
+    )
 
     django_settings_module: str
     strict_settings: bool
+    settings_type_snapshot: bool
+    settings_types_module: str | None
+    schema_snapshot: bool
+    report: bool
+    profile: bool
+    lookup_cache_size: int
 
     def __init__(self, config_file: str | None) -> None:
         if not config_file:
@@ -97,14 +128,33 @@ class DjangoPluginConfig:
         self.django_settings_module = django_settings_module
 
         if not isinstance(self.django_settings_module, str):
-            toml_exit("invalid 'django_settings_module': the setting must be a string")
+            toml_exit(INVALID_STR_SETTING.format(key="django_settings_module"))
 
         self.strict_settings = config.get("strict_settings", True)
         if not isinstance(self.strict_settings, bool):
             toml_exit(INVALID_BOOL_SETTING.format(key="strict_settings"))
+        self.settings_type_snapshot = config.get("settings_type_snapshot", False)
+        if not isinstance(self.settings_type_snapshot, bool):
+            toml_exit(INVALID_BOOL_SETTING.format(key="settings_type_snapshot"))
+        self.settings_types_module = config.get("settings_types_module") or None
+        if self.settings_types_module is not None and not isinstance(self.settings_types_module, str):
+            toml_exit(INVALID_STR_SETTING.format(key="settings_types_module"))
         self.strict_model_abstract_attrs = config.get("strict_model_abstract_attrs", True)
         if not isinstance(self.strict_model_abstract_attrs, bool):
             toml_exit(INVALID_BOOL_SETTING.format(key="strict_model_abstract_attrs"))
+        self.schema_snapshot = config.get("schema_snapshot", False)
+        if not isinstance(self.schema_snapshot, bool):
+            toml_exit(INVALID_BOOL_SETTING.format(key="schema_snapshot"))
+        self.report = config.get("report", False)
+        if not isinstance(self.report, bool):
+            toml_exit(INVALID_BOOL_SETTING.format(key="report"))
+        self.profile = config.get("profile", False)
+        if not isinstance(self.profile, bool):
+            toml_exit(INVALID_BOOL_SETTING.format(key="profile"))
+        lookup_cache_size = config.get("lookup_cache_size", DEFAULT_LOOKUP_CACHE_SIZE)
+        if not isinstance(lookup_cache_size, int) or isinstance(lookup_cache_size, bool) or lookup_cache_size < 0:
+            toml_exit(INVALID_SIZE_SETTING.format(key="lookup_cache_size"))
+        self.lookup_cache_size = lookup_cache_size
 
     def parse_ini_file(self, filepath: Path) -> None:
         parser = configparser.ConfigParser()
@@ -134,16 +184,47 @@ class DjangoPluginConfig:
         except ValueError:
             exit_with_error(INVALID_BOOL_SETTING.format(key="strict_settings"))
 
+        try:
+            self.settings_type_snapshot = parser.getboolean(section, "settings_type_snapshot", fallback=False)
+        except ValueError:
+            exit_with_error(INVALID_BOOL_SETTING.format(key="settings_type_snapshot"))
+
+        self.settings_types_module = parser.get(section, "settings_types_module", fallback="").strip("'\"") or None
+
         try:
             self.strict_model_abstract_attrs = parser.getboolean(section, "strict_model_abstract_attrs", fallback=True)
         except ValueError:
             exit_with_error(INVALID_BOOL_SETTING.format(key="strict_model_abstract_attrs"))
 
+        try:
+            self.schema_snapshot = parser.getboolean(section, "schema_snapshot", fallback=False)
+        except ValueError:
+            exit_with_error(INVALID_BOOL_SETTING.format(key="schema_snapshot"))
+
+        try:
+            self.report = parser.getboolean(section, "report", fallback=False)
+        except ValueError:
+            exit_with_error(INVALID_BOOL_SETTING.format(key="report"))
+
+        try:
+            self.profile = parser.getboolean(section, "profile", fallback=False)
+        except ValueError:
+            exit_with_error(INVALID_BOOL_SETTING.format(key="profile"))
+
+        try:
+            self.lookup_cache_size = parser.getint(section, "lookup_cache_size", fallback=DEFAULT_LOOKUP_CACHE_SIZE)
+        except ValueError:
+            exit_with_error(INVALID_SIZE_SETTING.format(key="lookup_cache_size"))
+        if self.lookup_cache_size < 0:
+            exit_with_error(INVALID_SIZE_SETTING.format(key="lookup_cache_size"))
+
     def to_json(self, extra_data: dict[str, Any]) -> dict[str, Any]:
         """We use this method to reset mypy cache via `report_config_data` hook."""
         return {
             "django_settings_module": self.django_settings_module,
             "strict_settings": self.strict_settings,
+            "settings_types_module": self.settings_types_module,
+            "settings_type_snapshot": self.settings_type_snapshot,
             "strict_model_abstract_attrs": self.strict_model_abstract_attrs,
             **dict(sorted(extra_data.items())),
         }
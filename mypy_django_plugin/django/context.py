@@ -2,17 +2,24 @@ from __future__ import annotations
 
 import os
 import sys
-from collections import defaultdict
+import time
+from collections import Counter, defaultdict, deque
 from contextlib import contextmanager
-from functools import cached_property
-from typing import TYPE_CHECKING, Any, Literal
+from functools import cache, cached_property
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypedDict
 
 from django.core.exceptions import FieldDoesNotExist, FieldError
 from django.db import models
 from django.db.models.base import Model
 from django.db.models.constants import LOOKUP_SEP
-from django.db.models.fields import AutoField, CharField, Field
+from django.db.models.fields import AutoField, CharField, DateField, DateTimeField, Field
 from django.db.models.fields.related import ForeignKey, RelatedField
+from django.db.models.fields.related_descriptors import (
+    ForwardManyToOneDescriptor,
+    ManyToManyDescriptor,
+    ReverseManyToOneDescriptor,
+    ReverseOneToOneDescriptor,
+)
 from django.db.models.fields.reverse_related import ForeignObjectRel
 from django.db.models.lookups import Exact, In
 from django.db.models.sql.query import Query
@@ -20,8 +27,21 @@ from mypy.typeanal import make_optional_type
 from mypy.types import AnyType, Instance, ProperType, TypeOfAny, UnionType, get_proper_type
 from mypy.types import Type as MypyType
 
+from mypy_django_plugin.config import DEFAULT_LOOKUP_CACHE_SIZE
+from mypy_django_plugin.django import schema
 from mypy_django_plugin.exceptions import UnregisteredModelError
 from mypy_django_plugin.lib import fullnames, helpers
+from mypy_django_plugin.lib.caches import (
+    ChoicesAttrTypeCache,
+    ClassCallCache,
+    DynamicManagerMethodCache,
+    SettingTypeCache,
+)
+from mypy_django_plugin.lib.class_body import ClassBodyIndexCache
+from mypy_django_plugin.lib.deferrals import DeferralLog
+from mypy_django_plugin.lib.lru import LRUCache
+from mypy_django_plugin.lib.report import find_plugin_caller
+from mypy_django_plugin.lib.row_types import RowTypeInterner
 
 # This import fails when `psycopg2` is not installed, avoid crashing the plugin.
 try:
@@ -33,12 +53,13 @@ except ImportError:
 
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator, Mapping, Sequence
+    from collections.abc import Collection, Iterable, Iterator, Mapping, Sequence
 
     from django.apps.registry import Apps
     from django.conf import LazySettings
     from django.db.models.expressions import Expression
-    from django.db.models.options import _AnyField
+    from django.db.models.lookups import Lookup
+    from django.db.models.options import Options, _AnyField
     from mypy.checker import TypeChecker
     from mypy.nodes import TypeInfo
     from mypy.plugin import MethodContext
@@ -55,29 +76,238 @@ def temp_environ() -> Iterator[None]:
         os.environ.update(environ)
 
 
-def initialize_django(settings_module: str) -> tuple[Apps, LazySettings]:
+def configure_django_settings(settings_module: str) -> LazySettings:
+    """Import the settings module only, which is much cheaper than populating the apps registry."""
     with temp_environ():
         os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
 
         # add current directory to sys.path
-        sys.path.append(os.getcwd())
+        if os.getcwd() not in sys.path:
+            sys.path.append(os.getcwd())
 
-        from django.apps import apps
         from django.conf import settings
 
-        apps.get_swappable_settings_name.cache_clear()  # type: ignore[attr-defined]
-        apps.clear_cache()
-
         if not settings.configured:
             settings._setup()  # type: ignore[misc]
+
+    assert settings.configured, "Settings are not configured"
+
+    return settings
+
+
+def initialize_django(settings_module: str) -> tuple[Apps, LazySettings]:
+    settings = configure_django_settings(settings_module)
+    with temp_environ():
+        os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+
+        from django.apps import apps
+
+        apps.get_swappable_settings_name.cache_clear()  # type: ignore[attr-defined]
+        apps.clear_cache()
         apps.populate(settings.INSTALLED_APPS)
 
     assert apps.apps_ready, "Apps are not ready"
-    assert settings.configured, "Settings are not configured"
 
     return apps, settings
 
 
+def solve_model_lookup_type(
+    model_cls: type[Model], lookup: str
+) -> tuple[Sequence[str], Sequence[str], Expression | Literal[False]]:
+    """Same as `Query(model_cls).solve_lookup_type(lookup)`, without constructing a `Query`.
+
+    Walks the fields the way `Query.names_to_path()` does for a query without annotations or
+    filtered relations, using the field maps and `path_infos` Django caches on each model.
+    Invalid lookups are delegated to `Query`, so that errors are raised exactly as Django does.
+    """
+    names = lookup.split(LOOKUP_SEP)
+    opts: Options[Any] | None = model_cls._meta
+    resolved = 0
+    for name in names:
+        if opts is None:
+            break
+        if name == "pk":
+            name = opts.pk.name
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            break
+        if field.is_relation and not field.related_model:
+            # e.g. a `GenericForeignKey`, which can't be used for querying
+            return Query(model_cls).solve_lookup_type(lookup)
+        resolved += 1
+        path_infos = getattr(field, "path_infos", None)
+        if path_infos is None:
+            # Local non-relational field, the remaining names are transforms and lookups
+            break
+        opts = path_infos[-1].to_opts
+
+    if not resolved:
+        return Query(model_cls).solve_lookup_type(lookup)
+    return names[resolved:], names[:resolved], False
+
+
+class ModelSchema:
+    """Fields and relations of a model, indexed once instead of scanning `_meta.get_fields()` on every use."""
+
+    __slots__ = (
+        "choice_fields",
+        "date_fields",
+        "fields",
+        "foreign_keys",
+        "primary_key",
+        "related_fields",
+        "relations",
+    )
+
+    def __init__(self, model_cls: type[Model]) -> None:
+        self.fields: list[Field[Any, Any]] = []
+        self.foreign_keys: list[ForeignKey[Any, Any]] = []
+        # Forward relations
+        self.related_fields: list[RelatedField[Any, Any]] = []
+        # Reverse relations
+        self.relations: list[ForeignObjectRel] = []
+        self.primary_key: Field[Any, Any] | None = None
+        for field in model_cls._meta.get_fields():
+            if isinstance(field, Field):
+                self.fields.append(field)
+                if field.primary_key and self.primary_key is None:
+                    self.primary_key = field
+                if isinstance(field, RelatedField):
+                    self.related_fields.append(field)
+                if isinstance(field, ForeignKey):
+                    self.foreign_keys.append(field)
+            elif isinstance(field, ForeignObjectRel):
+                self.relations.append(field)
+
+        # Fields getting a `get_FOO_display()` method
+        self.choice_fields = [field for field in self.fields if field.choices]
+        # Fields getting `get_next_by_FOO()` and `get_previous_by_FOO()` methods
+        self.date_fields = [
+            field for field in self.fields if isinstance(field, DateField | DateTimeField) and not field.null
+        ]
+
+
+class PrefetchTarget(NamedTuple):
+    """What a model attribute is to `prefetch_related()`."""
+
+    kind: Literal["missing", "relation", "generic_foreign_key", "unsupported"]
+    # The model a relation leads to
+    model_cls: Any = None
+
+
+def _get_prefetch_target(model_cls: type[Model], attr: str, *, contenttypes_installed: bool) -> PrefetchTarget:
+    rel_obj_descriptor = getattr(model_cls, attr, None)
+    if rel_obj_descriptor is None:
+        return PrefetchTarget("missing")
+    if isinstance(rel_obj_descriptor, ForwardManyToOneDescriptor):
+        return PrefetchTarget("relation", rel_obj_descriptor.field.remote_field.model)
+    if isinstance(rel_obj_descriptor, ReverseOneToOneDescriptor):
+        return PrefetchTarget("relation", rel_obj_descriptor.related.related_model)
+    if isinstance(rel_obj_descriptor, ManyToManyDescriptor):
+        return PrefetchTarget(
+            "relation",
+            rel_obj_descriptor.rel.related_model if rel_obj_descriptor.reverse else rel_obj_descriptor.rel.model,
+        )
+    if contenttypes_installed:
+        generic_foreign_key_descriptor, reverse_generic_descriptor = _get_generic_relation_descriptors()
+        if isinstance(rel_obj_descriptor, reverse_generic_descriptor):
+            return PrefetchTarget("relation", rel_obj_descriptor.rel.model)
+        if isinstance(rel_obj_descriptor, generic_foreign_key_descriptor):
+            return PrefetchTarget("generic_foreign_key")
+    if isinstance(rel_obj_descriptor, ReverseManyToOneDescriptor):
+        return PrefetchTarget("relation", rel_obj_descriptor.rel.related_model)
+    return PrefetchTarget("unsupported")
+
+
+@cache
+def _get_generic_relation_descriptors() -> tuple[type[Any], type[Any]]:
+    """Descriptors of generic relations, importable once `django.contrib.contenttypes` is installed."""
+    try:
+        from django.contrib.contenttypes.fields import GenericForeignKeyDescriptor
+    except ImportError:  # Django < 6.1
+        from django.contrib.contenttypes.fields import GenericForeignKey as GenericForeignKeyDescriptor  # type: ignore[assignment]
+    from django.contrib.contenttypes.fields import ReverseGenericManyToOneDescriptor
+
+    return GenericForeignKeyDescriptor, ReverseGenericManyToOneDescriptor
+
+
+class RelationCatalog:
+    """Relations of a model for `select_related()` and `prefetch_related()`, and the lookups validated against them.
+
+    A validated lookup keeps its error message, to report it again at every call using it.
+    """
+
+    __slots__ = (
+        "_prefetch_targets",
+        "contenttypes_installed",
+        "model_cls",
+        "prefetch_related_lookups",
+        "select_related_choices",
+        "select_related_lookups",
+    )
+
+    def __init__(self, model_cls: type[Model], *, contenttypes_installed: bool) -> None:
+        self.model_cls = model_cls
+        self.contenttypes_installed = contenttypes_installed
+        # Based on Django's `SQLCompiler.get_related_selections._get_field_choices()`
+        opts = model_cls._meta
+        self.select_related_choices = frozenset(
+            (
+                *(field.name for field in opts.fields if field.is_relation),
+                *(rel.field.related_query_name() for rel in opts.related_objects if rel.field.unique),
+            )
+        )
+        self._prefetch_targets: dict[str, PrefetchTarget] = {}
+        # Error message, if any, and result of the validation of a lookup starting at this model
+        self.select_related_lookups: dict[str, tuple[str | None, bool]] = {}
+        self.prefetch_related_lookups: dict[tuple[str, bool], tuple[str | None, bool]] = {}
+
+    def prefetch_target(self, attr: str) -> PrefetchTarget:
+        target = self._prefetch_targets.get(attr)
+        if target is None:
+            target = self._prefetch_targets[attr] = _get_prefetch_target(
+                self.model_cls, attr, contenttypes_installed=self.contenttypes_installed
+            )
+        return target
+
+
+class ResolvedLookup:
+    """A lookup solved against a model. The field it ends at is resolved on first use."""
+
+    __slots__ = (
+        "expected_type",
+        "expected_type_info",
+        "field",
+        "field_resolved",
+        "lookup_class",
+        "model_cls",
+        "solved",
+    )
+
+    def __init__(self, solved: tuple[Sequence[str], Sequence[str], Expression | Literal[False]] | None) -> None:
+        # `None` when the lookup can't be solved, e.g. 'pk' on an abstract model
+        self.solved = solved
+        self.field_resolved = False
+        self.field: _AnyField | None = None
+        # The model the lookup ends at
+        self.model_cls: type[Model] | None = None
+        # Class of the final lookup part, e.g. `Exact` for `name__exact`, or `None` without lookup parts
+        self.lookup_class: type[Lookup[Any]] | None = None
+        # Expected type of an `exact` or `in` value, valid while the `TypeInfo` it was built from stays the same
+        self.expected_type: MypyType | None = None
+        self.expected_type_info: TypeInfo | None = None
+
+
+class InitializationEvent(TypedDict):
+    phase: str
+    source: str
+    # Seconds since the context was created
+    started_at: float
+    duration: float
+    trigger: str
+
+
 class LookupsAreUnsupported(Exception):
     pass
 
@@ -114,12 +344,177 @@ def _get_field_get_type_from_model_type_info(info: TypeInfo | None, field_name:
 
 
 class DjangoContext:
-    def __init__(self, django_settings_module: str) -> None:
+    def __init__(
+        self,
+        django_settings_module: str,
+        *,
+        snapshot_path: str | None = None,
+        lookup_cache_size: int = DEFAULT_LOOKUP_CACHE_SIZE,
+    ) -> None:
+        # Nothing is initialized here: runs that never reach a hook needing Django data don't pay for it
         self.django_settings_module = django_settings_module
+        self.snapshot_path = snapshot_path
+        self.initialization_events: list[InitializationEvent] = []
+        self._created_at = time.perf_counter()
+        self._modules_before_boot: frozenset[str] | None = None
+        self._model_schemas: dict[type[Model], ModelSchema] = {}
+        self._relation_catalogs: dict[type[Model], RelationCatalog] = {}
+        self._expected_types_cache: dict[
+            tuple[type[Model], str], tuple[list[tuple[str, TypeInfo | None]], dict[str, MypyType]]
+        ] = {}
+        self.expected_types_stats: Counter[str] = Counter()
+        self.lookup_cache: LRUCache[tuple[type[Model], str], ResolvedLookup] = LRUCache(lookup_cache_size)
+        self.deferrals = DeferralLog()
+        self.class_bodies = ClassBodyIndexCache()
+        self._abstract_model_bases: dict[type[Model], tuple[type[Model], ...]] = {}
+        # Resolved arguments of the `ManyToManyField()` calls of abstract models
+        self.inherited_m2m_arguments: ClassCallCache[Any] = ClassCallCache()
+        self.row_types = RowTypeInterner()
+        self.manager_methods = DynamicManagerMethodCache()
+        self.choices_attr_types = ChoicesAttrTypeCache()
+        self.setting_type_cache = SettingTypeCache()
+        self.model_initializer_stats: Counter[str] = Counter()
+
+    @contextmanager
+    def _initializing(self, phase: str, source: str) -> Iterator[None]:
+        started = time.perf_counter()
+        trigger = find_plugin_caller(__file__, schema.__file__)
+        try:
+            yield
+        finally:
+            self.initialization_events.append(
+                {
+                    "phase": phase,
+                    "source": source,
+                    "started_at": started - self._created_at,
+                    "duration": time.perf_counter() - started,
+                    "trigger": trigger,
+                }
+            )
+
+    def initialization_report(self) -> dict[str, Any]:
+        return {"events": list(self.initialization_events)}
+
+    def _remember_modules_before_boot(self) -> None:
+        if self._modules_before_boot is None:
+            self._modules_before_boot = frozenset(sys.modules)
+
+    @cached_property
+    def _django_runtime(self) -> tuple[Apps, LazySettings]:
+        self._remember_modules_before_boot()
+        with self._initializing("apps", "runtime"):
+            return initialize_django(self.django_settings_module)
+
+    @property
+    def apps_registry(self) -> Apps:
+        return self._django_runtime[0]
+
+    @cached_property
+    def settings(self) -> LazySettings:
+        if "_django_runtime" in self.__dict__:
+            return self._django_runtime[1]
+        self._remember_modules_before_boot()
+        with self._initializing("settings", "runtime"):
+            return configure_django_settings(self.django_settings_module)
+
+    @cached_property
+    def _snapshot(self) -> schema.ProjectSchema | None:
+        """The schema of the snapshot, `None` without a snapshot or when it is out of date."""
+        if self.snapshot_path is None:
+            return None
+        with self._initializing("schema", "snapshot"):
+            return schema.load_snapshot(self.snapshot_path, self.django_settings_module)
+
+    @cached_property
+    def project_schema(self) -> schema.ProjectSchema:
+        """The model registry as plain data, loaded from the snapshot or extracted from the runtime.
+
+        Used for the dependencies between modules, the data validating mypy's cache and resolving model labels.
+        Hooks analyzing fields, managers and querysets still read the runtime classes of `apps_registry`.
+        """
+        if (snapshot := self._snapshot) is not None:
+            # Warm start: Django is only booted once a hook needs runtime classes
+            return snapshot
+
+        with self._initializing("schema", "runtime"):
+            project_schema = self.extract_schema(fingerprint=self.snapshot_path is not None)
+        if self.snapshot_path is not None:
+            schema.write_snapshot(self.snapshot_path, project_schema)
+        return project_schema
+
+    def extract_schema(self, *, fingerprint: bool) -> schema.ProjectSchema:
+        """Build the schema from the Django runtime of the current process."""
+        apps_registry = self.apps_registry
+        sources = {}
+        if fingerprint:
+            assert self._modules_before_boot is not None
+            boot_modules = [name for name in sys.modules if name not in self._modules_before_boot]
+            sources = schema.fingerprint_sources(boot_modules, apps_registry)
+        return schema.build_project_schema(self, sources)
+
+    @cached_property
+    def _schema_models_by_module(self) -> dict[str, list[schema.ModelEntry]]:
+        models_by_module: dict[str, list[schema.ModelEntry]] = defaultdict(list)
+        for model in self.project_schema["models"].values():
+            models_by_module[model["module"]].append(model)
+        return models_by_module
+
+    @property
+    def model_module_names(self) -> Collection[str]:
+        """Names of all modules that contain Django models, without booting Django."""
+        return self._schema_models_by_module.keys()
+
+    @cached_property
+    def model_relation_graph(self) -> dict[str, frozenset[str]]:
+        """Model module -> modules defining models related to it, in either direction."""
+        return {
+            module: frozenset(related_modules)
+            for module, related_modules in self.project_schema["relation_graph"].items()
+        }
+
+    def get_related_model_modules(self, module: str) -> frozenset[str]:
+        """Modules defining models that models of `module` relate to, in either direction."""
+        return self.model_relation_graph.get(module, frozenset())
 
-        apps, settings = initialize_django(self.django_settings_module)
-        self.apps_registry = apps
-        self.settings = settings
+    def relation_graph_report(self) -> dict[str, Any]:
+        if "model_relation_graph" not in self.__dict__:
+            return {}
+        graph = self.model_relation_graph
+        most_connected = sorted(graph, key=lambda module: (-len(graph[module]), module))[:5]
+        return {
+            "modules": len(graph),
+            "edges": sum(map(len, graph.values())) // 2,
+            "most_connected": [{"module": module, "related_modules": len(graph[module])} for module in most_connected],
+        }
+
+    @property
+    def schema_settings(self) -> Mapping[str, Any]:
+        """Values of `schema.SCHEMA_SETTINGS`, without populating the apps registry."""
+        if "project_schema" in self.__dict__:
+            return self.project_schema["settings"]
+        if (snapshot := self._snapshot) is not None:
+            return snapshot["settings"]
+        # Without an up-to-date snapshot, only the settings are configured until the schema is extracted
+        return schema.extract_settings(self.settings)
+
+    @cached_property
+    def setting_types(self) -> Mapping[str, list[Any]]:
+        """Types of the runtime values of all settings, see `schema.describe_value_type()`."""
+        if "project_schema" in self.__dict__ or self.snapshot_path is not None:
+            return self.project_schema["setting_types"]
+        return schema.extract_setting_types(self.settings)
+
+    def get_setting_types_digest(self) -> str:
+        """Hash of `setting_types`, the types of settings depend on."""
+        return schema.digest(self.setting_types)
+
+    @cached_property
+    def auth_user_model_module(self) -> str | None:
+        """Module of the `AUTH_USER_MODEL`, `None` when its app is not installed."""
+        fullname = self.model_class_fullname_for_label(self.schema_settings["AUTH_USER_MODEL"])
+        if fullname is None:
+            return None
+        return fullname.rpartition(".")[0]
 
     @cached_property
     def model_modules(self) -> dict[str, dict[str, type[Model]]]:
@@ -138,27 +533,33 @@ class DjangoContext:
         module, _, model_cls_name = fullname.rpartition(".")
         return self.model_modules.get(module, {}).get(model_cls_name)
 
-    def get_model_fields(self, model_cls: type[Model]) -> Iterator[Field[Any, Any]]:
-        for field in model_cls._meta.get_fields():
-            if isinstance(field, Field):
-                yield field
+    def get_model_schema(self, model_cls: type[Model]) -> ModelSchema:
+        model_schema = self._model_schemas.get(model_cls)
+        if model_schema is None:
+            model_schema = self._model_schemas[model_cls] = ModelSchema(model_cls)
+        return model_schema
 
-    def get_model_foreign_keys(self, model_cls: type[Model]) -> Iterator[ForeignKey[Any, Any]]:
-        for field in model_cls._meta.get_fields():
-            if isinstance(field, ForeignKey):
-                yield field
+    def get_relation_catalog(self, model_cls: type[Model]) -> RelationCatalog:
+        catalog = self._relation_catalogs.get(model_cls)
+        if catalog is None:
+            catalog = self._relation_catalogs[model_cls] = RelationCatalog(
+                model_cls, contenttypes_installed=self.apps_registry.is_installed("django.contrib.contenttypes")
+            )
+        return catalog
+
+    def get_model_fields(self, model_cls: type[Model]) -> Sequence[Field[Any, Any]]:
+        return self.get_model_schema(model_cls).fields
 
-    def get_model_related_fields(self, model_cls: type[Model]) -> Iterator[RelatedField[Any, Any]]:
+    def get_model_foreign_keys(self, model_cls: type[Model]) -> Sequence[ForeignKey[Any, Any]]:
+        return self.get_model_schema(model_cls).foreign_keys
+
+    def get_model_related_fields(self, model_cls: type[Model]) -> Sequence[RelatedField[Any, Any]]:
         """Get model forward relations"""
-        for field in model_cls._meta.get_fields():
-            if isinstance(field, RelatedField):
-                yield field
+        return self.get_model_schema(model_cls).related_fields
 
-    def get_model_relations(self, model_cls: type[Model]) -> Iterator[ForeignObjectRel]:
+    def get_model_relations(self, model_cls: type[Model]) -> Sequence[ForeignObjectRel]:
         """Get model reverse relations"""
-        for field in model_cls._meta.get_fields():
-            if isinstance(field, ForeignObjectRel):
-                yield field
+        return self.get_model_schema(model_cls).relations
 
     def get_field_lookup_exact_type(self, api: TypeChecker, field: _AnyField) -> MypyType:
         if isinstance(field, RelatedField | ForeignObjectRel):
@@ -192,14 +593,62 @@ class DjangoContext:
         return self.get_primary_key_field(related_model_cls)
 
     def get_primary_key_field(self, model_cls: type[Model]) -> Field[Any, Any]:
-        for field in model_cls._meta.get_fields():
-            if isinstance(field, Field):
-                if field.primary_key:
-                    return field
-        raise ValueError("No primary key defined")
+        primary_key = self.get_model_schema(model_cls).primary_key
+        if primary_key is None:
+            raise ValueError("No primary key defined")
+        return primary_key
 
     def get_expected_types(self, api: TypeChecker, model_cls: type[Model], *, method: str) -> dict[str, MypyType]:
-        contenttypes_in_apps = self.apps_registry.is_installed("django.contrib.contenttypes")
+        """Expected argument types of model methods like `__init__()` and `create()`.
+
+        Memoized per model class and method. An entry is rebuilt once any of the
+        model TypeInfos it was built from has been replaced.
+        """
+        key = (model_cls, method)
+        cached = self._expected_types_cache.get(key)
+        if cached is not None:
+            type_infos, expected_types = cached
+            if all(helpers.lookup_fully_qualified_typeinfo(api, fullname) is info for fullname, info in type_infos):
+                self.expected_types_stats["hits"] += 1
+                return expected_types
+            self.expected_types_stats["invalidations"] += 1
+
+        self.expected_types_stats["misses"] += 1
+        type_infos = []
+        expected_types = self._build_expected_types(api, model_cls, method=method, type_infos=type_infos)
+        self._expected_types_cache[key] = (type_infos, expected_types)
+        return expected_types
+
+    def expected_types_report(self) -> dict[str, Any]:
+        stats = self.expected_types_stats
+        return {
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "invalidations": stats["invalidations"],
+            "entries": len(self._expected_types_cache),
+        }
+
+    def _lookup_model_typeinfo(
+        self, api: TypeChecker, model_cls: type[Model], type_infos: list[tuple[str, TypeInfo | None]]
+    ) -> TypeInfo | None:
+        fullname = helpers.get_class_fullname(model_cls)
+        info = helpers.lookup_fully_qualified_typeinfo(api, fullname)
+        type_infos.append((fullname, info))
+        return info
+
+    def _build_expected_types(
+        self,
+        api: TypeChecker,
+        model_cls: type[Model],
+        *,
+        method: str,
+        type_infos: list[tuple[str, TypeInfo | None]],
+    ) -> dict[str, MypyType]:
+        generic_foreign_key_cls: type | None = None
+        if self.apps_registry.is_installed("django.contrib.contenttypes"):
+            from django.contrib.contenttypes.fields import GenericForeignKey
+
+            generic_foreign_key_cls = GenericForeignKey
 
         expected_types = {}
         # add pk if not abstract=True
@@ -208,12 +657,10 @@ class DjangoContext:
             field_set_type = self.get_field_set_type(api, primary_key_field, method=method)
             expected_types["pk"] = field_set_type
 
-        model_info = helpers.lookup_class_typeinfo(api, model_cls)
+        model_info = self._lookup_model_typeinfo(api, model_cls, type_infos)
         for field in model_cls._meta.get_fields():
-            if contenttypes_in_apps:
-                from django.contrib.contenttypes.fields import GenericForeignKey
-
-                if isinstance(field, GenericForeignKey):
+            if generic_foreign_key_cls is not None:
+                if isinstance(field, generic_foreign_key_cls):
                     # it's generic, so cannot set specific model
                     field_name = field.name
                     gfk_info = helpers.lookup_class_typeinfo(api, field.__class__)
@@ -259,7 +706,7 @@ class DjangoContext:
                     if related_model._meta.proxy_for_model is not None:
                         related_model = related_model._meta.proxy_for_model
 
-                    related_model_info = helpers.lookup_class_typeinfo(api, related_model)
+                    related_model_info = self._lookup_model_typeinfo(api, related_model, type_infos)
                     if related_model_info is None:
                         expected_types[field_name] = AnyType(TypeOfAny.unannotated)
                         continue
@@ -286,12 +733,47 @@ class DjangoContext:
 
         return all_model_bases
 
+    @cached_property
+    def _concrete_descendants_by_abstract_model(self) -> Mapping[type[Model], Sequence[type[Model]]]:
+        descendants: defaultdict[type[Model], list[type[Model]]] = defaultdict(list)
+        for model_cls in self.all_registered_model_classes:
+            if model_cls is Model or model_cls._meta.abstract:
+                continue
+            for base_cls in model_cls.__mro__[1:-1]:
+                if base_cls is not Model and issubclass(base_cls, Model) and base_cls._meta.abstract:
+                    descendants[base_cls].append(model_cls)
+        return descendants
+
+    def get_concrete_descendants(self, abstract_model_cls: type[Model]) -> Sequence[type[Model]]:
+        """Concrete models inheriting from `abstract_model_cls`, directly or not."""
+        return self._concrete_descendants_by_abstract_model.get(abstract_model_cls, ())
+
+    def get_abstract_model_bases(self, model_cls: type[Model]) -> Sequence[type[Model]]:
+        """Abstract models `model_cls` inherits from without a concrete model in between, in breadth first order."""
+        abstract_bases = self._abstract_model_bases.get(model_cls)
+        if abstract_bases is None:
+            found: list[type[Model]] = []
+            queue = deque([model_cls])
+            while queue:
+                for base_cls in queue.popleft().__bases__:
+                    if (
+                        base_cls is not Model
+                        and issubclass(base_cls, Model)
+                        and base_cls._meta.abstract
+                        and base_cls not in found
+                    ):
+                        found.append(base_cls)
+                        queue.append(base_cls)
+            abstract_bases = self._abstract_model_bases[model_cls] = tuple(found)
+        return abstract_bases
+
     @cached_property
     def _model_class_fullnames_by_label_lower(self) -> Mapping[str, str]:
+        # Same classes as `all_registered_model_classes`, but available without booting Django
         return {
-            klass._meta.label_lower: helpers.get_class_fullname(klass)
-            for klass in self.all_registered_model_classes
-            if klass is not models.Model
+            model["label_lower"]: fullname
+            for fullname, model in self.project_schema["models"].items()
+            if not model["auto_created"] and not model["swapped"]
         }
 
     def model_class_fullname_for_label(self, label: str) -> str | None:
@@ -299,6 +781,19 @@ class DjangoContext:
         app_label, _, model_name = label.partition(".")
         return self._model_class_fullnames_by_label_lower.get(f"{app_label}.{model_name.lower()}")
 
+    def get_model_module_digest(self, module: str) -> str | None:
+        """Hash of the schema that the analysis of `module` depends on, `None` for modules without models."""
+        models = self._schema_models_by_module.get(module)
+        if not models:
+            return None
+        return schema.model_module_digest(self.project_schema, module, models)
+
+    def model_module_for_label(self, label: str) -> str | None:
+        fullname = self.model_class_fullname_for_label(label)
+        if fullname is None:
+            return None
+        return self.project_schema["models"][fullname]["module"]
+
     def get_field_nullability(self, field: _AnyField, method: str | None) -> bool:
         if method in ("values", "values_list"):
             return field.null
@@ -427,13 +922,13 @@ class DjangoContext:
     def solve_lookup_type(
         self, model_cls: type[Model], lookup: str
     ) -> tuple[Sequence[str], Sequence[str], Expression | Literal[False]] | None:
-        query = Query(model_cls)
-        if (lookup == "pk" or lookup.startswith("pk__")) and query.get_meta().pk is None:  # type: ignore[comparison-overlap]
+        opts = model_cls._meta
+        if (lookup == "pk" or lookup.startswith("pk__")) and opts.pk is None:  # type: ignore[comparison-overlap]
             # Primary key lookup when no primary key field is found, model is presumably
             # abstract and we can't say anything about 'pk'.
-            return None
+            return None  # type: ignore[unreachable]
         try:
-            return query.solve_lookup_type(lookup)
+            return solve_model_lookup_type(model_cls, lookup)
         # This occurs when the following conditions are met:
         # - model_cls._meta.abstract = True
         # - part of the lookup is a foreign key defined on model_cls where the 'to' argument is a string
@@ -443,7 +938,7 @@ class DjangoContext:
             pass
         query_parts = lookup.split(LOOKUP_SEP)
         try:
-            field = query.get_meta().get_field(query_parts[0])
+            field = opts.get_field(query_parts[0])
         except FieldDoesNotExist:
             return None
 
@@ -454,18 +949,47 @@ class DjangoContext:
             return None
 
         related_model = self.get_field_related_model_cls(field)
-        sub_query = Query(related_model).solve_lookup_type(LOOKUP_SEP.join(query_parts[1:]))
+        sub_query = solve_model_lookup_type(related_model, LOOKUP_SEP.join(query_parts[1:]))
         entire_query_parts = [query_parts[0], *sub_query[1]]
         return sub_query[0], entire_query_parts, sub_query[2]
 
+    def resolve_lookup(self, model_cls: type[Model], lookup: str) -> ResolvedLookup:
+        """Solve a lookup against a model, remembering the most recently used ones.
+
+        Lookups that can't be solved raise `FieldError` every time, they aren't cached.
+        """
+        key = (model_cls, lookup)
+        resolved = self.lookup_cache.get(key)
+        if resolved is None:
+            resolved = ResolvedLookup(self.solve_lookup_type(model_cls, lookup))
+            self.lookup_cache.put(key, resolved)
+        return resolved
+
+    def _resolve_lookup_field(self, model_cls: type[Model], resolved: ResolvedLookup) -> tuple[_AnyField, type[Model]]:
+        if not resolved.field_resolved:
+            assert resolved.solved is not None
+            lookup_parts, field_parts, _ = resolved.solved
+            resolved.field, resolved.model_cls = self._resolve_field_from_parts(field_parts, model_cls)
+            resolved.lookup_class = resolved.field.get_lookup(lookup_parts[-1]) if lookup_parts else None
+            resolved.field_resolved = True
+        assert resolved.field is not None
+        assert resolved.model_cls is not None
+        return resolved.field, resolved.model_cls
+
+    def model_initializers_report(self) -> dict[str, Any]:
+        return {"runs": self.model_initializer_stats["runs"], "skipped": self.model_initializer_stats["skipped"]}
+
+    def lookup_cache_report(self) -> dict[str, Any]:
+        return self.lookup_cache.stats()
+
     def resolve_lookup_into_field(self, model_cls: type[Model], lookup: str) -> tuple[_AnyField | None, type[Model]]:
-        solved_lookup = self.solve_lookup_type(model_cls, lookup)
-        if solved_lookup is None:
+        resolved = self.resolve_lookup(model_cls, lookup)
+        if resolved.solved is None:
             return None, model_cls
-        lookup_parts, field_parts, _ = solved_lookup
+        lookup_parts, _, _ = resolved.solved
         if lookup_parts:
             raise LookupsAreUnsupported()
-        return self._resolve_field_from_parts(field_parts, model_cls)
+        return self._resolve_lookup_field(model_cls, resolved)
 
     def _resolve_lookup_type_from_lookup_class(
         self, ctx: MethodContext, lookup_cls: type, field: _AnyField | None = None
@@ -541,7 +1065,7 @@ class DjangoContext:
         try:
             # solve_lookup_type uses Django's Query.solve_lookup_type(), which raises
             # FieldError for annotated fields since they don't exist on the actual model...
-            solved_lookup = self.solve_lookup_type(model_cls, lookup)
+            resolved = self.resolve_lookup(model_cls, lookup)
         except FieldError as exc:
             # ...so we handle annotation lookups here
             annotation_lookup = self._resolve_annotated_field_lookup(ctx, lookup, model_instance)
@@ -554,28 +1078,21 @@ class DjangoContext:
             ctx.api.fail(msg, ctx.context)
             return AnyType(TypeOfAny.from_error)
 
-        if solved_lookup is None:
+        if resolved.solved is None:
             return AnyType(TypeOfAny.implementation_artifact)
-        lookup_parts, field_parts, is_expression = solved_lookup
+        lookup_parts, _, is_expression = resolved.solved
         if is_expression:
             return AnyType(TypeOfAny.explicit)
 
-        field, _ = self._resolve_field_from_parts(field_parts, model_cls)
+        field, _ = self._resolve_lookup_field(model_cls, resolved)
 
-        lookup_cls = None
-        if lookup_parts:
-            lookup = lookup_parts[-1]
-            lookup_cls = field.get_lookup(lookup)
-            if lookup_cls is None:
-                # unknown lookup
-                return AnyType(TypeOfAny.explicit)
-
-        if lookup_cls is None or issubclass(lookup_cls, Exact):
-            return self.get_field_lookup_exact_type(helpers.get_typechecker_api(ctx), field)
+        lookup_cls = resolved.lookup_class
+        if lookup_parts and lookup_cls is None:
+            # unknown lookup
+            return AnyType(TypeOfAny.explicit)
 
-        if issubclass(lookup_cls, In):
-            exact_type = self.get_field_lookup_exact_type(helpers.get_typechecker_api(ctx), field)
-            return ctx.api.named_generic_type("typing.Iterable", [exact_type])
+        if lookup_cls is None or issubclass(lookup_cls, Exact | In):
+            return self._get_lookup_value_type(ctx, resolved, field)
 
         resolved_type = self._resolve_lookup_type_from_lookup_class(ctx, lookup_cls, field)
         if resolved_type is not None:
@@ -583,6 +1100,25 @@ class DjangoContext:
 
         return AnyType(TypeOfAny.explicit)
 
+    def _get_lookup_value_type(self, ctx: MethodContext, resolved: ResolvedLookup, field: _AnyField) -> MypyType:
+        """Expected type of the value of an `exact` or `in` lookup, kept on the resolved lookup."""
+        api = helpers.get_typechecker_api(ctx)
+        # The model a relation leads to, or the field class, which the type is built from
+        if isinstance(field, RelatedField | ForeignObjectRel):
+            type_info = helpers.lookup_class_typeinfo(api, self.get_field_related_model_cls(field))
+        else:
+            type_info = helpers.lookup_class_typeinfo(api, field.__class__)
+        if resolved.expected_type is not None and resolved.expected_type_info is type_info:
+            return resolved.expected_type
+
+        expected_type = self.get_field_lookup_exact_type(api, field)
+        if resolved.lookup_class is not None and issubclass(resolved.lookup_class, In):
+            expected_type = ctx.api.named_generic_type("typing.Iterable", [expected_type])
+        if type_info is not None:
+            resolved.expected_type = expected_type
+            resolved.expected_type_info = type_info
+        return expected_type
+
     def resolve_f_expression_type(self, f_expression_type: Instance) -> ProperType:
         return AnyType(TypeOfAny.explicit)
 
@@ -0,0 +1,55 @@
+"""Print the graph of relations between model modules, as JSON or in Graphviz DOT format.
+
+Each edge makes both modules depend on each other in mypy's build graph, so that editing one of them
+invalidates the cache of the other. Use this to spot modules that are coupled by accident:
+
+    python -m mypy_django_plugin.django.relation_graph <django_settings_module> [--format {json,dot}]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import sys
+from typing import TYPE_CHECKING
+
+from mypy_django_plugin.django.context import DjangoContext
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping, Sequence
+
+
+def render_dot(graph: Mapping[str, Collection[str]]) -> str:
+    lines = ["graph model_modules {"]
+    for module in sorted(graph):
+        lines.append(f"    {json.dumps(module)};")
+    # The graph is symmetric, list each edge once
+    for module in sorted(graph):
+        lines.extend(
+            f"    {json.dumps(module)} -- {json.dumps(related_module)};"
+            for related_module in sorted(graph[module])
+            if module < related_module
+        )
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def render_json(graph: Mapping[str, Collection[str]]) -> str:
+    return json.dumps({module: sorted(graph[module]) for module in sorted(graph)}, indent=2)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m mypy_django_plugin.django.relation_graph", description=__doc__)
+    parser.add_argument("django_settings_module")
+    parser.add_argument("--format", choices=("json", "dot"), default="json")
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        graph = DjangoContext(args.django_settings_module).model_relation_graph
+    print(render_dot(graph) if args.format == "dot" else render_json(graph))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
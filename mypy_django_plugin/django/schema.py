@@ -0,0 +1,355 @@
+"""Serializable description of the model registry of a Django project.
+
+A `ProjectSchema` describes which modules define models, how those models relate to each other and
+a few key settings. The plugin reads it for the dependencies between modules, the data validating
+mypy's cache and resolving model labels. Hooks analyzing fields, managers and querysets still use the
+runtime model classes.
+It is plain JSON, so it can be stored on disk between runs and reused as long as the sources it was
+extracted from did not change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import os
+import sys
+import tempfile
+import warnings
+from typing import TYPE_CHECKING, Any, Final, TypedDict
+
+import django
+from django.db.models.fields import Field
+from django.db.models.fields.related import RelatedField
+
+from mypy_django_plugin.exceptions import UnregisteredModelError
+from mypy_django_plugin.lib import helpers
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from django.apps.registry import Apps
+    from django.conf import LazySettings
+    from django.db.models.base import Model
+    from django.db.models.fields.reverse_related import ForeignObjectRel
+
+    from mypy_django_plugin.django.context import DjangoContext
+
+# Bump whenever the layout of the schema or the way it is extracted changes.
+SCHEMA_VERSION: Final = 3
+
+# Settings the plugin needs before any runtime class is touched.
+SCHEMA_SETTINGS: Final = ("INSTALLED_APPS", "AUTH_USER_MODEL", "DEFAULT_AUTO_FIELD")
+
+# Items of a `describe_value_type()` description that aren't a class fullname
+ANY_TYPE: Final = "Any"
+NONE_TYPE: Final = "None"
+
+
+class SchemaKey(TypedDict):
+    version: int
+    django_settings_module: str
+    django_version: str
+
+
+class FieldSchema(TypedDict):
+    name: str
+    attname: str | None
+    field_class: str
+    null: bool
+    primary_key: bool
+    # Fullname of the model on the other side of a relation, if any
+    related_model: str | None
+
+
+class RelationSchema(TypedDict):
+    name: str
+    accessor_name: str | None
+    field_class: str
+    hidden: bool
+    related_model: str | None
+
+
+class ModelEntry(TypedDict):
+    module: str
+    name: str
+    label_lower: str
+    abstract: bool
+    auto_created: bool
+    swapped: bool
+    pk: str | None
+    fields: list[FieldSchema]
+    relations: list[RelationSchema]
+    managers: dict[str, str]
+
+
+class ProjectSchema(TypedDict):
+    key: SchemaKey
+    settings: dict[str, Any]
+    # Setting name -> type of its runtime value, see `describe_value_type()`
+    setting_types: dict[str, list[Any]]
+    models: dict[str, ModelEntry]
+    # Model module -> modules defining models related to it, in either direction
+    relation_graph: dict[str, list[str]]
+    # Source file path -> [mtime_ns, size, sha1]; sha1 is empty for files that must not exist
+    sources: dict[str, list[Any]]
+
+
+def schema_key(django_settings_module: str) -> SchemaKey:
+    return {
+        "version": SCHEMA_VERSION,
+        "django_settings_module": django_settings_module,
+        "django_version": django.get_version(),
+    }
+
+
+def _related_model_fullname(
+    django_context: DjangoContext, field: RelatedField[Any, Any] | ForeignObjectRel
+) -> str | None:
+    try:
+        return helpers.get_class_fullname(django_context.get_field_related_model_cls(field))
+    except UnregisteredModelError:
+        return None
+
+
+def _model_entry(django_context: DjangoContext, model_cls: type[Model]) -> ModelEntry:
+    opts = model_cls._meta
+    fields: list[FieldSchema] = []
+    for field in opts.get_fields():
+        if not isinstance(field, Field):
+            continue
+        fields.append(
+            {
+                "name": field.name,
+                "attname": getattr(field, "attname", None),
+                "field_class": helpers.get_class_fullname(type(field)),
+                "null": field.null,
+                "primary_key": field.primary_key,
+                "related_model": (
+                    _related_model_fullname(django_context, field) if isinstance(field, RelatedField) else None
+                ),
+            }
+        )
+    # `related_objects` is private API (according to docstring), it includes the hidden m2m relations
+    relations: list[RelationSchema] = [
+        {
+            "name": rel.name,
+            "accessor_name": rel.get_accessor_name(),
+            "field_class": helpers.get_class_fullname(type(rel)),
+            "hidden": rel.hidden,
+            "related_model": _related_model_fullname(django_context, rel),
+        }
+        for rel in opts.related_objects
+    ]
+    return {
+        "module": model_cls.__module__,
+        "name": model_cls.__name__,
+        "label_lower": opts.label_lower,
+        "abstract": opts.abstract,
+        "auto_created": bool(opts.auto_created),
+        "swapped": bool(opts.swapped),
+        "pk": opts.pk.name if opts.pk is not None else None,  # type: ignore[comparison-overlap, redundant-expr]
+        "fields": fields,
+        "relations": relations,
+        "managers": {manager.name: helpers.get_class_fullname(type(manager)) for manager in opts.managers},
+    }
+
+
+def build_project_schema(django_context: DjangoContext, sources: dict[str, list[Any]]) -> ProjectSchema:
+    """Extract the schema from an initialized Django runtime."""
+    models = {
+        helpers.get_class_fullname(model_cls): _model_entry(django_context, model_cls)
+        for module_models in django_context.model_modules.values()
+        for model_cls in module_models.values()
+    }
+    return {
+        "key": schema_key(django_context.django_settings_module),
+        "settings": extract_settings(django_context.settings),
+        "setting_types": extract_setting_types(django_context.settings),
+        "models": models,
+        "relation_graph": build_relation_graph(models),
+        "sources": sources,
+    }
+
+
+def build_relation_graph(models: dict[str, ModelEntry]) -> dict[str, list[str]]:
+    """Link each model module to the modules of the models its models relate to, and the other way around."""
+    graph: dict[str, set[str]] = {model["module"]: set() for model in models.values()}
+    for model in models.values():
+        module = model["module"]
+        for relation in itertools.chain(model["fields"], model["relations"]):
+            related_model = relation["related_model"]
+            if related_model is None:
+                continue
+            related_entry = models.get(related_model)
+            related_module = related_entry["module"] if related_entry else related_model.rpartition(".")[0]
+            if related_module != module:
+                graph[module].add(related_module)
+                graph.setdefault(related_module, set()).add(module)
+    return {module: sorted(related_modules) for module, related_modules in sorted(graph.items())}
+
+
+def digest(data: Any) -> str:
+    """A short, stable hash of JSON-able data."""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha1(encoded, usedforsecurity=False).hexdigest()
+
+
+def model_module_digest(project_schema: ProjectSchema, module: str, models: list[ModelEntry]) -> str:
+    """Hash of the part of the schema that the analysis of a model module depends on.
+
+    That is its own models, the models they relate to, the modules it depends on and the default
+    type of implicit primary keys.
+    """
+    related_models = {
+        relation["related_model"]
+        for model in models
+        for relation in itertools.chain(model["fields"], model["relations"])
+        if relation["related_model"] is not None
+    }
+    return digest(
+        {
+            "models": models,
+            "related_models": {fullname: project_schema["models"].get(fullname) for fullname in sorted(related_models)},
+            "related_modules": project_schema["relation_graph"].get(module, []),
+            "DEFAULT_AUTO_FIELD": project_schema["settings"]["DEFAULT_AUTO_FIELD"],
+        }
+    )
+
+
+def extract_settings(settings: LazySettings) -> dict[str, Any]:
+    return {name: _jsonable(getattr(settings, name)) for name in SCHEMA_SETTINGS}
+
+
+def extract_setting_types(settings: LazySettings) -> dict[str, list[Any]]:
+    names = [name for name in dir(settings) if name.isupper()]
+    # Unlike `LazySettings`, the settings object doesn't validate values, e.g. reject an empty `SECRET_KEY`
+    settings_object = settings.__dict__["_wrapped"]
+    with warnings.catch_warnings():
+        # Reading a deprecated setting warns
+        warnings.simplefilter("ignore")
+        return {name: describe_value_type(getattr(settings_object, name)) for name in names}
+
+
+def describe_value_type(value: Any) -> list[Any]:
+    """The type of a runtime value as JSON: `[<class fullname>, *<descriptions of its type arguments>]`.
+
+    Only builtin types are described, anything else is `ANY_TYPE`. Items of a container
+    are described by their common type, if they have one.
+    """
+    if value is None:
+        return [NONE_TYPE]
+    value_type = type(value)
+    if value_type in {bool, int, float, str, bytes}:
+        return [f"builtins.{value_type.__name__}"]
+    if value_type in {list, tuple, set, frozenset}:
+        return [f"builtins.{value_type.__name__}", _describe_common_type(value)]
+    if value_type is dict:
+        return ["builtins.dict", _describe_common_type(value.keys()), _describe_common_type(value.values())]
+    return [ANY_TYPE]
+
+
+def _describe_common_type(values: Iterable[Any]) -> list[Any]:
+    common_type = None
+    for value in values:
+        value_type = describe_value_type(value)
+        if common_type is None:
+            common_type = value_type
+        elif value_type != common_type:
+            return [ANY_TYPE]
+    return common_type or [ANY_TYPE]
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, list | tuple):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read(), usedforsecurity=False).hexdigest()
+
+
+def _fingerprint(path: str) -> list[Any]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return [0, 0, ""]
+    return [stat.st_mtime_ns, stat.st_size, _file_digest(path)]
+
+
+def fingerprint_sources(module_names: Iterable[str], apps_registry: Apps) -> dict[str, list[Any]]:
+    """Fingerprint the files whose changes may alter the schema.
+
+    These are the modules imported while Django was booting (settings, app configs, models and
+    anything they import), except for the standard library and Django itself, which are covered by
+    the Django version in the key. The `models` module candidates of every app are included even
+    when missing, so that adding one invalidates the snapshot.
+    """
+    paths: set[str] = set()
+    for name in module_names:
+        top_level = name.partition(".")[0]
+        if top_level == "django" or top_level in sys.stdlib_module_names:
+            continue
+        path = getattr(sys.modules.get(name), "__file__", None)
+        if path is not None:
+            paths.add(os.path.abspath(path))
+    for app_config in apps_registry.get_app_configs():
+        paths.add(os.path.join(app_config.path, "models.py"))
+        paths.add(os.path.join(app_config.path, "models", "__init__.py"))
+    return {path: _fingerprint(path) for path in sorted(paths)}
+
+
+def _sources_unchanged(sources: dict[str, list[Any]]) -> bool:
+    for path, (mtime_ns, size, digest) in sources.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            if digest:
+                return False
+            continue
+        if not digest:
+            return False
+        if stat.st_mtime_ns == mtime_ns and stat.st_size == size:
+            continue
+        try:
+            if _file_digest(path) != digest:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def load_snapshot(path: str, django_settings_module: str) -> ProjectSchema | None:
+    """Return the stored schema, or `None` when it is missing, unreadable or out of date."""
+    try:
+        with open(path, "rb") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("key") != schema_key(django_settings_module):
+        return None
+    sources = data.get("sources")
+    if not isinstance(sources, dict) or not _sources_unchanged(sources):
+        return None
+    schema: ProjectSchema = data  # type: ignore[assignment]
+    return schema
+
+
+def write_snapshot(path: str, schema: ProjectSchema) -> None:
+    """Atomically store the schema; failures only cost a cold start next time."""
+    directory = os.path.dirname(path) or "."
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(schema, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
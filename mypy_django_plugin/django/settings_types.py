@@ -0,0 +1,82 @@
+"""Write the types of your project settings as a stub module, for the `settings_types_module` option.
+
+Each setting is typed from its runtime value, settings defined by Django keep their types from django-stubs.
+Check the stub in next to your settings and generate it again when they change:
+
+    python -m mypy_django_plugin.django.settings_types <django_settings_module> [--output <path>.pyi] [--check]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from django.conf import global_settings
+
+from mypy_django_plugin.django.context import DjangoContext
+from mypy_django_plugin.django.schema import ANY_TYPE, NONE_TYPE
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping, Sequence
+
+
+def render_stub(django_settings_module: str, setting_types: Mapping[str, list[Any]], skip: Collection[str]) -> str:
+    """A stub declaring each setting of `setting_types` not in `skip`, see `schema.describe_value_type()`."""
+    types = {name: render_type(setting_types[name]) for name in sorted(setting_types) if name not in skip}
+    lines = [f"# Generated by `python -m mypy_django_plugin.django.settings_types {django_settings_module}`"]
+    if any(ANY_TYPE in _type_names(setting_types[name]) for name in types):
+        lines += ["", "from typing import Any"]
+    if types:
+        lines += ["", *(f"{name}: {setting_type}" for name, setting_type in types.items())]
+    return "\n".join(lines) + "\n"
+
+
+def render_type(description: list[Any]) -> str:
+    fullname, *args = description
+    if fullname in {ANY_TYPE, NONE_TYPE}:
+        return str(fullname)
+    name = str(fullname).removeprefix("builtins.")
+    if not args:
+        return name
+    # Tuples are described by the common type of their items, whatever their length
+    rendered_args = [render_type(arg) for arg in args] + (["..."] if name == "tuple" else [])
+    return f"{name}[{', '.join(rendered_args)}]"
+
+
+def _type_names(description: list[Any]) -> set[str]:
+    fullname, *args = description
+    return {fullname}.union(*(_type_names(arg) for arg in args))
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m mypy_django_plugin.django.settings_types", description=__doc__)
+    parser.add_argument("django_settings_module")
+    parser.add_argument("--output", type=Path, help="write the stub to this file instead of stdout")
+    parser.add_argument("--check", action="store_true", help="exit with 1 when `--output` is not up to date")
+    args = parser.parse_args(argv)
+    if args.check and args.output is None:
+        parser.error("--check requires --output")
+
+    # Anything printed by project modules must not end up in the stub
+    with contextlib.redirect_stdout(sys.stderr):
+        setting_types = DjangoContext(args.django_settings_module).setting_types
+    # `SETTINGS_MODULE` is an attribute of `LazySettings` in the stubs
+    skip = {*dir(global_settings), "SETTINGS_MODULE"}
+    stub = render_stub(args.django_settings_module, setting_types, skip)
+
+    if args.output is None:
+        sys.stdout.write(stub)
+    elif args.check:
+        if not args.output.is_file() or args.output.read_text() != stub:
+            print(f"{args.output} is out of date, run without --check to update it", file=sys.stderr)
+            return 1
+    else:
+        args.output.write_text(stub)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""Caches of the plugin hooks, reused across passes and modules within a mypy run.
+
+mypy's `TypeInfo`s can't hold extra attributes, so entries computed from a class are keyed by its fullname
+and only reused for the same `TypeInfo`: a class gets a new `TypeInfo` when its module is processed again.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Generic
+
+from mypy.types import PartialType, get_proper_type
+from typing_extensions import TypeVar, override
+
+if TYPE_CHECKING:
+    from mypy.nodes import CallExpr, TypeInfo
+    from mypy.types import ProperType
+    from mypy.types import Type as MypyType
+
+_V = TypeVar("_V")
+
+
+class CountingCache(ABC):
+    """Counts the hits and misses of a cache, for the plugin report."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of entries, for the plugin report."""
+
+    def _count(self, value: _V | None) -> _V | None:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+
+class ClassCallCache(CountingCache, Generic[_V]):
+    """Values computed from calls in the body of a class, per class fullname and call.
+
+    Used for the `ManyToManyField()` calls of abstract models, that every concrete subclass processes again.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._entries: dict[str, tuple[TypeInfo, dict[int, tuple[CallExpr, _V]]]] = {}
+
+    @override
+    def __len__(self) -> int:
+        return sum(len(calls) for _, calls in self._entries.values())
+
+    def _calls(self, info: TypeInfo) -> dict[int, tuple[CallExpr, _V]]:
+        entry = self._entries.get(info.fullname)
+        if entry is None or entry[0] is not info:
+            entry = self._entries[info.fullname] = (info, {})
+        return entry[1]
+
+    def get(self, info: TypeInfo, call: CallExpr) -> _V | None:
+        cached = self._calls(info).get(id(call))
+        return self._count(cached[1] if cached is not None and cached[0] is call else None)
+
+    def set(self, info: TypeInfo, call: CallExpr, value: _V) -> None:
+        # The call is kept alive with the value, so its `id()` can't be reused
+        self._calls(info)[id(call)] = (call, value)
+
+
+class SettingTypeCache(CountingCache):
+    """Types of `settings.<NAME>` per setting name.
+
+    Only complete types are stored, a setting mypy didn't infer yet is looked up again on the next pass.
+    Cleared when the settings module or the global settings are parsed again, e.g. by the daemon.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._types: dict[str, MypyType] = {}
+
+    @override
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def get(self, name: str) -> MypyType | None:
+        return self._count(self._types.get(name))
+
+    def set(self, name: str, setting_type: MypyType) -> None:
+        if not isinstance(get_proper_type(setting_type), PartialType):
+            self._types[name] = setting_type
+
+    def clear(self) -> None:
+        self._types.clear()
+
+
+class DynamicManagerMethodCache(CountingCache):
+    """Types of the methods of managers built by `.from_queryset()`, per manager, model and method name.
+
+    Entries are only reused for the same manager, model and queryset `TypeInfo`.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._entries: dict[tuple[str, str, str], tuple[tuple[TypeInfo, TypeInfo, TypeInfo], ProperType]] = {}
+
+    @override
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, manager_info: TypeInfo, model_info: TypeInfo, queryset_info: TypeInfo, method_name: str
+    ) -> ProperType | None:
+        entry = self._entries.get((manager_info.fullname, model_info.fullname, method_name))
+        if entry is None:
+            return self._count(None)
+        (cached_manager, cached_model, cached_queryset), method_type = entry
+        is_valid = cached_manager is manager_info and cached_model is model_info and cached_queryset is queryset_info
+        return self._count(method_type if is_valid else None)
+
+    def set(
+        self,
+        manager_info: TypeInfo,
+        model_info: TypeInfo,
+        queryset_info: TypeInfo,
+        method_name: str,
+        method_type: ProperType,
+    ) -> None:
+        key = (manager_info.fullname, model_info.fullname, method_name)
+        self._entries[key] = ((manager_info, model_info, queryset_info), method_type)
+
+
+class ChoicesAttrTypeCache(CountingCache):
+    """Types of the attributes of choices types, per choices type, attribute name and default attribute type.
+
+    Entries are only reused for the same choices `TypeInfo`.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._entries: dict[tuple[str, str, MypyType], tuple[TypeInfo, MypyType]] = {}
+
+    @override
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, node: TypeInfo, name: str, default_attr_type: MypyType) -> MypyType | None:
+        entry = self._entries.get((node.fullname, name, default_attr_type))
+        return self._count(entry[1] if entry is not None and entry[0] is node else None)
+
+    def set(self, node: TypeInfo, name: str, default_attr_type: MypyType, attr_type: MypyType) -> None:
+        self._entries[(node.fullname, name, default_attr_type)] = (node, attr_type)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from mypy.nodes import AssignmentStmt, NameExpr
+from typing_extensions import override
+
+from mypy_django_plugin.lib.caches import CountingCache
+
+if TYPE_CHECKING:
+    from mypy.nodes import ClassDef, Context
+
+
+class ClassBodyIndex:
+    """Assignments of a class body, by the identity of their rvalue and by the first name they assign to."""
+
+    __slots__ = ("body", "by_name", "by_rvalue", "defn", "length")
+
+    def __init__(self, defn: ClassDef) -> None:
+        self.defn = defn
+        self.body = defn.defs.body
+        self.length = len(self.body)
+        # The statements keep their rvalue alive, so its `id()` can't be reused
+        self.by_rvalue: dict[int, AssignmentStmt] = {}
+        self.by_name: dict[str, AssignmentStmt] = {}
+        for stmt in self.body:
+            if not isinstance(stmt, AssignmentStmt):
+                continue
+            self.by_rvalue.setdefault(id(stmt.rvalue), stmt)
+            if isinstance(stmt.lvalues[0], NameExpr):
+                self.by_name.setdefault(stmt.lvalues[0].name, stmt)
+
+    def is_valid_for(self, defn: ClassDef) -> bool:
+        # Statements are only ever appended to or removed from a class body, e.g. by plugins
+        return self.defn is defn and self.body is defn.defs.body and self.length == len(defn.defs.body)
+
+    def assignment_of(self, rvalue: Context) -> AssignmentStmt | None:
+        """The assignment statement whose rvalue is `rvalue`."""
+        return self.by_rvalue.get(id(rvalue))
+
+    def assignment_to(self, name: str) -> AssignmentStmt | None:
+        """The first assignment statement to `name`."""
+        return self.by_name.get(name)
+
+
+class ClassBodyIndexCache(CountingCache):
+    """A `ClassBodyIndex` per class fullname, built again when the class body changed."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._entries: dict[str, ClassBodyIndex] = {}
+
+    @override
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, defn: ClassDef) -> ClassBodyIndex:
+        index = self._entries.get(defn.fullname)
+        if index is not None and index.is_valid_for(defn):
+            self.hits += 1
+            return index
+        self.misses += 1
+        index = self._entries[defn.fullname] = ClassBodyIndex(defn)
+        return index
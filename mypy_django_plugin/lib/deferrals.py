@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from mypy.semanal import SemanticAnalyzer
+
+# Entries listed per breakdown in the plugin report
+WORST_OFFENDERS: Final = 5
+
+
+class DeferralLog:
+    """Counts of the semantic analysis deferrals requested by the plugin.
+
+    Every deferral makes mypy analyze the module's SCC once more, the report points at what causes them.
+    """
+
+    __slots__ = ("by_initializer", "by_model", "by_module", "by_reason", "total")
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.by_module: Counter[str] = Counter()
+        self.by_model: Counter[str] = Counter()
+        self.by_initializer: Counter[str] = Counter()
+        self.by_reason: Counter[tuple[str, str]] = Counter()
+
+    def record(self, api: SemanticAnalyzer, initializer: str, reason: str, *, model: str | None = None) -> None:
+        self.total += 1
+        self.by_module[api.cur_mod_id] += 1
+        if model is not None:
+            self.by_model[model] += 1
+        self.by_initializer[initializer] += 1
+        self.by_reason[initializer, reason] += 1
+
+    def defer(self, api: SemanticAnalyzer, initializer: str, reason: str, *, model: str | None = None) -> None:
+        """Record a deferral and request it, unless this is the final iteration."""
+        if api.final_iteration:
+            return
+        self.record(api, initializer, reason, model=model)
+        api.defer()
+
+    def report(self) -> dict[str, Any]:
+        if not self.total:
+            return {}
+        return {
+            "total": self.total,
+            "by_initializer": dict(self.by_initializer.most_common()),
+            "worst_modules": [
+                {"module": module, "deferrals": count} for module, count in self.by_module.most_common(WORST_OFFENDERS)
+            ],
+            "worst_models": [
+                {"model": model, "deferrals": count} for model, count in self.by_model.most_common(WORST_OFFENDERS)
+            ],
+            "worst_reasons": [
+                {"initializer": initializer, "reason": reason, "deferrals": count}
+                for (initializer, reason), count in self.by_reason.most_common(WORST_OFFENDERS)
+            ],
+        }
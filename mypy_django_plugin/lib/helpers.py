@@ -78,6 +78,8 @@ class DjangoTypeMetadata(TypedDict, total=False):
     m2m_throughs: dict[str, str]
     m2m_managers: dict[str, str]
     manager_to_model: str
+    completed_initializers: list[str]
+    choices_label_laziness: str
 
 
 def get_django_metadata(model_info: TypeInfo) -> DjangoTypeMetadata:
@@ -664,10 +666,12 @@ def resolve_lazy_reference(
         model_info = lookup_fully_qualified_typeinfo(api, fullname)
         if model_info is not None:
             return model_info
-        if isinstance(api, SemanticAnalyzer) and not api.final_iteration:
+        if isinstance(api, SemanticAnalyzer):
             # Getting this far, where Django matched the reference but we still can't
             # find it, we want to defer
-            api.defer()
+            django_context.deferrals.defer(
+                api, "resolve_lazy_reference", f"Lazy reference {reference!r} not analyzed yet", model=fullname
+            )
     else:
         api.fail("Could not match lazy reference with any model", ctx)
     return None
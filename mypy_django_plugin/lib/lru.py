@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Generic
+
+from typing_extensions import TypeVar
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+
+class LRUCache(Generic[_K, _V]):
+    """A mapping holding at most `maxsize` entries, evicting the least recently used one first.
+
+    A `maxsize` of 0 disables caching. Hits, misses and evictions are counted for the plugin report.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[_K, _V] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: _K) -> _V | None:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: _K, value: _V) -> None:
+        if not self.maxsize:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "maxsize": self.maxsize,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,203 @@
+"""Opt-in timing of the plugin hooks, printed to stderr at exit as a table or as JSON."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import os
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any, Final
+
+from mypy.nodes import ClassDef, Context
+from mypy.types import Instance, get_proper_type
+from typing_extensions import TypeVar
+
+from mypy_django_plugin.lib import helpers
+from mypy_django_plugin.lib.report import print_at_exit
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from mypy.options import Options
+    from mypy.types import Type as MypyType
+
+_A = TypeVar("_A")
+_T = TypeVar("_T")
+
+PROFILE_ENV_VAR: Final = "DJANGO_STUBS_PROFILE"
+
+# Slowest calls kept per hook
+SLOWEST_CALLS: Final = 5
+
+
+def profile_format_from_env() -> str | None:
+    """`json` or `table` when profiling is requested by the environment, `None` otherwise."""
+    value = os.getenv(PROFILE_ENV_VAR, "").lower()
+    if value == "json":
+        return "json"
+    if value in {"1", "true", "yes", "on", "table"}:
+        return "table"
+    return None
+
+
+def hook_name(hook: Callable[..., Any]) -> str:
+    """Name of the function behind a hook, e.g. `querysets.extract_proper_type_queryset_annotate`."""
+    while isinstance(hook, partial):
+        hook = hook.func
+    module = getattr(hook, "__module__", None) or ""
+    return f"{module.rpartition('.')[2]}.{getattr(hook, '__qualname__', repr(hook))}".lstrip(".")
+
+
+def describe_call_site(ctx: Any) -> str:
+    """Location and model of a hook call, e.g. `myapp/views.py:12 (myapp.models.Book)`."""
+    context = getattr(ctx, "context", None) or getattr(ctx, "call", None) or getattr(ctx, "cls", None)
+    line = context.line if isinstance(context, Context) else -1
+
+    path = None
+    # The type analyzer wraps the semantic analyzer
+    plugin_api = getattr(ctx, "api", None)
+    for api in (plugin_api, getattr(plugin_api, "api", None)):
+        path = getattr(api, "path", None) or getattr(getattr(api, "cur_mod_node", None), "path", None)
+        if path:
+            break
+    site = f"{os.path.relpath(path) if path else '?'}:{line}"
+
+    model = _describe_model(ctx)
+    return f"{site} ({model})" if model else site
+
+
+def _describe_model(ctx: Any) -> str | None:
+    cls = getattr(ctx, "cls", None)
+    if isinstance(cls, ClassDef):
+        return cls.fullname
+    for attr in ("type", "default_return_type"):
+        ctx_type: MypyType | None = getattr(ctx, attr, None)
+        typ = get_proper_type(ctx_type)
+        if not isinstance(typ, Instance):
+            continue
+        if helpers.is_model_type(typ.type):
+            return typ.type.fullname
+        if (model := helpers.extract_model_type_from_queryset(typ)) is not None:
+            return model.type.fullname
+    return None
+
+
+class HookStats:
+    __slots__ = ("calls", "max", "slowest", "total")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        # Min-heap of (duration, sequence number, call site)
+        self.slowest: list[tuple[float, int, str]] = []
+
+    def as_dict(self, name: str) -> dict[str, Any]:
+        return {
+            "hook": name,
+            "calls": self.calls,
+            "total": self.total,
+            "max": self.max,
+            "slowest": [
+                {"duration": duration, "site": site} for duration, _, site in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+
+class HookProfiler:
+    """Call counts and wall time of every hook, and of the hook getters mypy calls to find them.
+
+    Times are inclusive: a hook that initializes Django, or makes mypy run other hooks, is charged for it.
+    """
+
+    def __init__(self, output_format: str = "table") -> None:
+        self.output_format = output_format
+        self.hooks: dict[str, HookStats] = {}
+        self._sequence = itertools.count()
+
+    def record(self, name: str, duration: float, describe: Callable[[], str]) -> None:
+        stats = self.hooks.get(name)
+        if stats is None:
+            stats = self.hooks[name] = HookStats()
+        stats.calls += 1
+        stats.total += duration
+        stats.max = max(stats.max, duration)
+        # Only describe the calls that make it into the slowest ones
+        if len(stats.slowest) < SLOWEST_CALLS:
+            heapq.heappush(stats.slowest, (duration, next(self._sequence), describe()))
+        elif duration > stats.slowest[0][0]:
+            heapq.heapreplace(stats.slowest, (duration, next(self._sequence), describe()))
+
+    def wrap_hook(self, kind: str, hook: Callable[[Any], _T]) -> Callable[[Any], _T]:
+        name = f"{kind}: {hook_name(hook)}"
+
+        def profiled_hook(ctx: Any) -> _T:
+            started = time.perf_counter()
+            try:
+                return hook(ctx)
+            finally:
+                self.record(name, time.perf_counter() - started, partial(describe_call_site, ctx))
+
+        return profiled_hook
+
+    def wrap_getter(
+        self, kind: str, getter: Callable[[str], Callable[[Any], _T] | None]
+    ) -> Callable[[str], Callable[[Any], _T] | None]:
+        """Time a `get_*_hook` method and every hook it returns."""
+        name = getter.__name__
+
+        def profiled_getter(fullname: str) -> Callable[[Any], _T] | None:
+            started = time.perf_counter()
+            hook = getter(fullname)
+            self.record(name, time.perf_counter() - started, lambda: fullname)
+            if hook is None:
+                return None
+            return self.wrap_hook(kind, hook)
+
+        return profiled_getter
+
+    def wrap_function(self, function: Callable[[_A], _T], describe: Callable[[_A], str]) -> Callable[[_A], _T]:
+        """Time a plugin method that isn't a hook getter, like `get_additional_deps`."""
+        name = function.__name__
+
+        def profiled_function(arg: _A) -> _T:
+            started = time.perf_counter()
+            try:
+                return function(arg)
+            finally:
+                self.record(name, time.perf_counter() - started, lambda: describe(arg))
+
+        return profiled_function
+
+    def collect(self, initialization_events: list[Any]) -> dict[str, Any]:
+        rows = sorted(self.hooks.items(), key=lambda item: item[1].total, reverse=True)
+        return {
+            "django_context_initialization": {
+                "duration": sum(event["duration"] for event in initialization_events),
+                "events": initialization_events,
+            },
+            "hooks": [stats.as_dict(name) for name, stats in rows],
+        }
+
+    def render(self, initialization_events: list[Any]) -> str:
+        data = self.collect(initialization_events)
+        if self.output_format == "json":
+            return json.dumps(data, indent=2)
+
+        initialization = data["django_context_initialization"]
+        lines = ["django-stubs profile:", f"  DjangoContext initialization: {initialization['duration']:.3f}s"]
+        lines.extend(
+            f"    {event['phase']} from {event['source']}: {event['duration']:.3f}s, by {event['trigger']}"
+            for event in initialization["events"]
+        )
+        width = max((len(row["hook"]) for row in data["hooks"]), default=4)
+        lines.append(f"  {'hook':<{width}}  {'calls':>8}  {'total':>9}  {'max':>9}")
+        for row in data["hooks"]:
+            lines.append(f"  {row['hook']:<{width}}  {row['calls']:>8}  {row['total']:>8.3f}s  {row['max']:>8.3f}s")
+            lines.extend(f"      {call['duration']:.4f}s  {call['site']}" for call in row["slowest"])
+        return "\n".join(lines)
+
+    def print_at_exit(self, options: Options, initialization_events: Callable[[], list[Any]]) -> None:
+        print_at_exit(options, lambda: self.render(initialization_events()))
@@ -0,0 +1,98 @@
+"""Counters and timings collected during a mypy run, printed to stderr at exit when enabled."""
+
+from __future__ import annotations
+
+import atexit
+import gc
+import json
+import os
+import sys
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import FrameType
+
+    from mypy.options import Options
+
+REPORT_ENV_VAR: Final = "DJANGO_STUBS_REPORT"
+
+PLUGIN_ROOT: Final = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def report_format_from_env() -> str | None:
+    """`json` or `text` when the report is requested by the environment, `None` otherwise."""
+    value = os.getenv(REPORT_ENV_VAR, "").lower()
+    if value == "json":
+        return "json"
+    if value in {"1", "true", "yes", "on", "text"}:
+        return "text"
+    return None
+
+
+def print_at_exit(options: Options, render: Callable[[], str]) -> None:
+    """Print `render()` to stderr when mypy exits."""
+    # mypy skips `atexit` handlers when it exits fast
+    options.fast_exit = False
+
+    def write() -> None:
+        print(render(), file=sys.stderr)
+        # Spare the interpreter a collection of mypy's whole heap at shutdown, that fast exits avoid
+        gc.freeze()
+
+    atexit.register(write)
+
+
+def find_plugin_caller(*internal_files: str) -> str:
+    """Describe the innermost plugin frame outside `internal_files`, e.g. `get_additional_deps (main.py:120)`."""
+    frame: FrameType | None = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PLUGIN_ROOT) and filename not in internal_files:
+            location = os.path.relpath(filename, PLUGIN_ROOT)
+            return f"{frame.f_code.co_name} ({location}:{frame.f_lineno})"
+        frame = frame.f_back
+    return "unknown"
+
+
+class PluginReport:
+    """Named sections of data, each collected lazily by a callback when the report is rendered."""
+
+    def __init__(self, output_format: str = "text") -> None:
+        self.output_format = output_format
+        self._sections: dict[str, Callable[[], dict[str, Any]]] = {}
+
+    def add_section(self, name: str, collect: Callable[[], dict[str, Any]]) -> None:
+        self._sections[name] = collect
+
+    def collect(self) -> dict[str, dict[str, Any]]:
+        return {name: collect() for name, collect in self._sections.items()}
+
+    def render(self) -> str:
+        data = self.collect()
+        if self.output_format == "json":
+            return json.dumps(data, indent=2, default=str)
+
+        lines = ["django-stubs report:"]
+        for section, section_data in data.items():
+            lines.append(f"  {section}:")
+            if not section_data:
+                lines.append("    (nothing recorded)")
+            for key, value in section_data.items():
+                if isinstance(value, list):
+                    lines.append(f"    {key}:")
+                    lines.extend(f"      - {_render_value(item)}" for item in value)
+                else:
+                    lines.append(f"    {key}: {_render_value(value)}")
+        return "\n".join(lines)
+
+    def print_at_exit(self, options: Options) -> None:
+        print_at_exit(options, self.render)
+
+
+def _render_value(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    if isinstance(value, dict):
+        return ", ".join(f"{key}={_render_value(item)}" for key, item in value.items())
+    return str(value)
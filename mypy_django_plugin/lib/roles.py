@@ -0,0 +1,168 @@
+"""Bitmask of the Django base classes a class derives from, used to dispatch plugin hooks.
+
+mypy asks the plugin for a hook on nearly every call and attribute access. Instead of walking the
+MRO with `TypeInfo.has_base()` for each candidate base on every request, the roles of a class are
+computed once and tested with a single `&`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Final
+
+from mypy.nodes import Decorator, FuncDef, OverloadedFuncDef, Var
+from mypy.types import CallableType, Instance, Overloaded, TypeVarType, get_proper_type, has_type_vars
+from typing_extensions import override
+
+from mypy_django_plugin.lib import fullnames, helpers
+from mypy_django_plugin.lib.caches import CountingCache
+
+if TYPE_CHECKING:
+    from mypy.nodes import TypeInfo
+    from mypy.types import Type as MypyType
+
+FIELD: Final = 1 << 0
+MODEL: Final = 1 << 1
+BASE_MANAGER: Final = 1 << 2
+MANAGER: Final = 1 << 3
+QUERYSET: Final = 1 << 4
+PREFETCH: Final = 1 << 5
+FUNC_EXPRESSION: Final = 1 << 6
+OPTIONS: Final = 1 << 7
+APPS: Final = 1 << 8
+STATE_APPS: Final = 1 << 9
+QUERYDICT: Final = 1 << 10
+BASEFORM: Final = 1 << 11
+PERMISSION_MIXIN: Final = 1 << 12
+ABSTRACT_USER: Final = 1 << 13
+STR_PROMISE: Final = 1 << 14
+CHOICES: Final = 1 << 15
+CHOICES_TYPE_METACLASS: Final = 1 << 16
+
+_ROLE_BASES: Final = {
+    fullnames.FIELD_FULLNAME: FIELD,
+    fullnames.BASE_MANAGER_CLASS_FULLNAME: BASE_MANAGER,
+    fullnames.MANAGER_CLASS_FULLNAME: MANAGER,
+    fullnames.QUERYSET_CLASS_FULLNAME: QUERYSET,
+    fullnames.PREFETCH_CLASS_FULLNAME: PREFETCH,
+    fullnames.FUNC_EXPRESSION_FULLNAME: FUNC_EXPRESSION,
+    fullnames.OPTIONS_CLASS_FULLNAME: OPTIONS,
+    fullnames.APPS_FULLNAME: APPS,
+    fullnames.STATE_APPS_FULLNAME: STATE_APPS,
+    fullnames.QUERYDICT_CLASS_FULLNAME: QUERYDICT,
+    fullnames.BASEFORM_CLASS_FULLNAME: BASEFORM,
+    fullnames.PERMISSION_MIXIN_CLASS_FULLNAME: PERMISSION_MIXIN,
+    fullnames.ABSTRACT_USER_MODEL_FULLNAME: ABSTRACT_USER,
+    fullnames.STR_PROMISE_FULLNAME: STR_PROMISE,
+    fullnames.CHOICES_CLASS_FULLNAME: CHOICES,
+    fullnames.CHOICES_TYPE_METACLASS_FULLNAME: CHOICES_TYPE_METACLASS,
+}
+
+
+def compute_class_roles(info: TypeInfo) -> int:
+    roles = 0
+    for base in info.mro:
+        roles |= _ROLE_BASES.get(base.fullname, 0)
+    if helpers.is_model_type(info):
+        roles |= MODEL
+    return roles
+
+
+def _may_return_annotated_queryset(ret_type: MypyType) -> bool:
+    ret_type = get_proper_type(ret_type)
+    if isinstance(ret_type, TypeVarType):
+        # e.g. `Self`, bound to an annotated queryset when called on one
+        return True
+    if not isinstance(ret_type, Instance):
+        return False
+    if has_type_vars(ret_type):
+        return True
+    model = helpers.extract_model_type_from_queryset(ret_type)
+    return model is not None and helpers.is_annotated_model(model.type)
+
+
+def method_may_return_annotations(info: TypeInfo, method_name: str) -> bool:
+    """Whether calling the method on a queryset or manager can give a queryset of annotated models.
+
+    Only such methods need `merge_annotations_from_custom_method`. Anything that cannot be told
+    from the signature, like a missing or not yet inferred type, is assumed to need it.
+    """
+    sym = info.get(method_name)
+    node = sym.node if sym is not None else None
+    if isinstance(node, FuncDef) and node.type is None:
+        # Unannotated methods return `Any`
+        return False
+    method_type: MypyType | None
+    if isinstance(node, (FuncDef, OverloadedFuncDef)):
+        method_type = node.type
+    elif isinstance(node, Decorator):
+        method_type = node.var.type
+    elif isinstance(node, Var):
+        method_type = node.type
+    else:
+        return True
+    method_type = get_proper_type(method_type)
+    if isinstance(method_type, CallableType):
+        return _may_return_annotated_queryset(method_type.ret_type)
+    if isinstance(method_type, Overloaded):
+        return any(_may_return_annotated_queryset(item.ret_type) for item in method_type.items)
+    return True
+
+
+class _ClassEntry:
+    __slots__ = ("info", "metaclass_type", "methods", "mro", "roles")
+
+    def __init__(self, info: TypeInfo, roles: int) -> None:
+        self.info = info
+        self.mro = info.mro
+        self.metaclass_type = info.metaclass_type
+        self.roles = roles
+        # Results of `method_may_return_annotations()` per method name
+        self.methods: dict[str, bool] = {}
+
+    def is_valid_for(self, info: TypeInfo) -> bool:
+        return self.info is info and self.mro is info.mro and self.metaclass_type is info.metaclass_type
+
+
+class ClassRoleCache(CountingCache):
+    """Roles per class fullname.
+
+    An entry is recomputed when the class got a new `TypeInfo` (e.g. when a module is reprocessed),
+    a new MRO or a new metaclass (e.g. once the semantic analyzer resolved its bases).
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._entries: dict[str, _ClassEntry] = {}
+
+    @override
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get_entry(self, info: TypeInfo) -> _ClassEntry:
+        entry = self._entries.get(info.fullname)
+        if entry is not None and entry.is_valid_for(info):
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = _ClassEntry(info, compute_class_roles(info))
+        if info.mro:
+            self._entries[info.fullname] = entry
+        return entry
+
+    def get(self, info: TypeInfo) -> int:
+        return self._get_entry(info).roles
+
+    def method_may_return_annotations(self, info: TypeInfo, method_name: str) -> bool:
+        methods = self._get_entry(info).methods
+        result = methods.get(method_name)
+        if result is None:
+            result = methods[method_name] = method_may_return_annotations(info, method_name)
+        return result
+
+    @override
+    def stats(self) -> dict[str, Any]:
+        return {
+            **super().stats(),
+            "annotated_methods": sum(sum(entry.methods.values()) for entry in self._entries.values()),
+            "plain_methods": sum(len(entry.methods) - sum(entry.methods.values()) for entry in self._entries.values()),
+        }
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from mypy_django_plugin.lib import helpers
+
+if TYPE_CHECKING:
+    from mypy.checker import TypeChecker
+    from mypy.nodes import TypeInfo
+    from mypy.plugin import CheckerPluginInterface
+    from mypy.types import TupleType, TypedDictType
+    from mypy.types import Type as MypyType
+
+    _Columns = tuple[tuple[str, MypyType], ...]
+
+
+class RowTypeInterner:
+    """Row types of `values()` and `values_list(named=True)`, shared by the calls selecting the same columns.
+
+    Rows are keyed by model and their columns, in order: the column types cover the annotations of the queryset.
+    Typed dicts are only reused for the same model `TypeInfo`, which is replaced when its module is processed again.
+    Named tuples are classes of the module they're used in, so they are only shared within a module.
+    """
+
+    def __init__(self) -> None:
+        self._typeddicts: dict[tuple[str, _Columns], tuple[TypeInfo, TypedDictType]] = {}
+        self._named_tuples: dict[tuple[str, str, _Columns], TupleType] = {}
+        self.created: Counter[str] = Counter()
+        self.reused: Counter[str] = Counter()
+
+    def typeddict(
+        self, api: CheckerPluginInterface, model_info: TypeInfo, columns: dict[str, MypyType]
+    ) -> TypedDictType:
+        key = (model_info.fullname, tuple(columns.items()))
+        entry = self._typeddicts.get(key)
+        if entry is not None and entry[0] is model_info:
+            self.reused["typeddict"] += 1
+            return entry[1]
+        self.created["typeddict"] += 1
+        row_type = helpers.make_typeddict(api, columns)
+        self._typeddicts[key] = (model_info, row_type)
+        return row_type
+
+    def named_tuple(self, api: TypeChecker, model_fullname: str, columns: dict[str, MypyType]) -> TupleType:
+        module = helpers.get_current_module(api)
+        key = (module.fullname, model_fullname, tuple(columns.items()))
+        row_type = self._named_tuples.get(key)
+        if row_type is not None:
+            # The class is gone when the module was processed again
+            sym = module.names.get(row_type.partial_fallback.type.name)
+            if sym is not None and sym.node is row_type.partial_fallback.type:
+                self.reused["named_tuple"] += 1
+                return row_type
+        self.created["named_tuple"] += 1
+        row_type = self._named_tuples[key] = helpers.make_oneoff_named_tuple(api, "Row", columns)
+        return row_type
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            kind: {"created": self.created[kind], "reused": self.reused[kind]}
+            for kind in ("typeddict", "named_tuple")
+            if self.created[kind]
+        }
@@ -1,14 +1,31 @@
 from __future__ import annotations
 
 import importlib.metadata
-import itertools
+import os
 import sys
 from functools import cache, cached_property, partial
+from operator import attrgetter
 from typing import TYPE_CHECKING, Any, Final
 
+import mypy
 from mypy.build import PRI_MED, PRI_MYPY
 from mypy.modulefinder import mypy_path
-from mypy.nodes import Import, ImportFrom, MypyFile, TypeInfo
+from mypy.nodes import (
+    Block,
+    ClassDef,
+    Decorator,
+    ForStmt,
+    FuncDef,
+    IfStmt,
+    Import,
+    ImportFrom,
+    MypyFile,
+    Statement,
+    TryStmt,
+    TypeInfo,
+    WhileStmt,
+    WithStmt,
+)
 from mypy.plugin import (
     AnalyzeTypeContext,
     AttributeContext,
@@ -23,8 +40,10 @@ from typing_extensions import override
 
 from mypy_django_plugin.config import DjangoPluginConfig
 from mypy_django_plugin.django.context import DjangoContext
-from mypy_django_plugin.exceptions import UnregisteredModelError
-from mypy_django_plugin.lib import fullnames, helpers
+from mypy_django_plugin.lib import fullnames, helpers, roles
+from mypy_django_plugin.lib.profiler import HookProfiler, profile_format_from_env
+from mypy_django_plugin.lib.report import PluginReport, report_format_from_env
+from mypy_django_plugin.lib.roles import ClassRoleCache
 from mypy_django_plugin.transformers import (
     apps,
     choices,
@@ -58,13 +77,24 @@ from mypy_django_plugin.transformers.models import (
 from mypy_django_plugin.transformers.request import check_querydict_is_mutable
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Collection
 
     from mypy.options import Options
     from mypy.types import Type as MypyType
 
 
 _APPS_MODULES: Final = frozenset({"django.apps", "django.apps.registry"})
+_TYPESHED_DIR: Final = os.path.join(os.path.dirname(mypy.__file__), "typeshed", "")
+_PROFILED_HOOKS: Final = (
+    "function",
+    "method",
+    "customize_class_mro",
+    "metaclass",
+    "base_class",
+    "attribute",
+    "type_analyze",
+    "dynamic_class",
+)
 
 
 class NewSemanalDjangoPlugin(Plugin):
@@ -75,7 +105,53 @@ class NewSemanalDjangoPlugin(Plugin):
         sys.path.extend(mypy_path())
         # Add paths from mypy_path config option
         sys.path.extend(options.mypy_path)
-        self.django_context = DjangoContext(self.plugin_config.django_settings_module)
+        self.django_context = DjangoContext(
+            self.plugin_config.django_settings_module,
+            snapshot_path=self._snapshot_path(options),
+            lookup_cache_size=self.plugin_config.lookup_cache_size,
+        )
+        self.class_roles = ClassRoleCache()
+        # Lazy references per source path, with the modification time of the scanned file
+        report_format = report_format_from_env() or ("text" if self.plugin_config.report else None)
+        self.report = PluginReport(report_format or "text")
+        self.report.add_section("initialization", self.django_context.initialization_report)
+        self.report.add_section("expected_types_cache", self.django_context.expected_types_report)
+        self.report.add_section("lookup_cache", self.django_context.lookup_cache_report)
+        self.report.add_section("relation_graph", self.django_context.relation_graph_report)
+        self.report.add_section("class_roles", self.class_roles.stats)
+        self.report.add_section("class_body_index", self.django_context.class_bodies.stats)
+        self.report.add_section("inherited_m2m_arguments", self.django_context.inherited_m2m_arguments.stats)
+        self.report.add_section("row_types", self.django_context.row_types.stats)
+        self.report.add_section("manager_methods", self.django_context.manager_methods.stats)
+        self.report.add_section("choices_attr_types", self.django_context.choices_attr_types.stats)
+        self.report.add_section("setting_types", self.django_context.setting_type_cache.stats)
+        self.report.add_section("deferrals", self.django_context.deferrals.report)
+        self.report.add_section("model_initializers", self.django_context.model_initializers_report)
+        if report_format is not None:
+            self.report.print_at_exit(options)
+        profile_format = profile_format_from_env() or ("table" if self.plugin_config.profile else None)
+        if profile_format is not None:
+            self._install_profiler(HookProfiler(profile_format), options)
+
+    def _install_profiler(self, profiler: HookProfiler, options: Options) -> None:
+        """Time every hook getter of this instance, the hooks they return and the per-module methods."""
+        for kind in _PROFILED_HOOKS:
+            getter_name = f"get_{kind}_hook"
+            setattr(self, getter_name, profiler.wrap_getter(kind, getattr(self, getter_name)))
+        # Called once or twice per module, not through a hook getter
+        for name, describe in (
+            ("get_additional_deps", attrgetter("fullname")),
+            ("report_config_data", attrgetter("id")),
+        ):
+            setattr(self, name, profiler.wrap_function(getattr(self, name), describe))
+        profiler.print_at_exit(options, lambda: self.django_context.initialization_events)
+
+    def _snapshot_path(self, options: Options) -> str | None:
+        if not self.plugin_config.schema_snapshot or not options.incremental or options.cache_dir == os.devnull:
+            return None
+        return os.path.join(
+            options.cache_dir, "django-stubs", f"{self.plugin_config.django_settings_module}.schema.json"
+        )
 
     def _get_typeinfo_or_none(self, class_name: str) -> TypeInfo | None:
         sym = self.lookup_fully_qualified(class_name)
@@ -96,10 +172,56 @@ class NewSemanalDjangoPlugin(Plugin):
                 return True
         return False
 
+    def _file_may_define_models(self, file: MypyFile) -> bool:
+        """Whether the file defines a class with bases or a metaclass, anywhere but in a class body.
+
+        Models may be declared through wrappers re-exporting Django's classes, so imports don't tell.
+        """
+        statements: list[Statement] = list(file.defs)
+        while statements:
+            statement = statements.pop()
+            if isinstance(statement, ClassDef):
+                if statement.base_type_exprs or statement.metaclass is not None:
+                    return True
+            elif isinstance(statement, Decorator):
+                statements.append(statement.func)
+            elif isinstance(statement, FuncDef):
+                statements.extend(statement.body.body)
+            elif isinstance(statement, Block):
+                statements.extend(statement.body)
+            elif isinstance(statement, (IfStmt, ForStmt, WhileStmt, WithStmt, TryStmt)):
+                statements.extend(_nested_blocks(statement))
+        return False
+
+    def _get_model_modules(self, file: MypyFile) -> Collection[str]:
+        lazy_references = apps.find_get_model_references(file)
+        if lazy_references is None:
+            # Any model may be referred to
+            return self.django_context.model_module_names
+        return {
+            module
+            for lazy_reference in lazy_references
+            if (module := self.django_context.model_module_for_label(lazy_reference)) is not None
+        }
+
     @override
     def get_additional_deps(self, file: MypyFile) -> list[tuple[int, str, int]]:
         # for settings
+        settings_types_module = self.plugin_config.settings_types_module
+        if file.fullname in {
+            self.django_context.django_settings_module,
+            settings_types_module,
+            "django.conf.global_settings",
+        }:
+            # Parsed again, e.g. by the daemon: types of settings are inferred again
+            self.django_context.setting_type_cache.clear()
         if file.fullname == "django.conf" and self.django_context.django_settings_module:
+            if settings_types_module is not None:
+                # A stub of the settings module, see `mypy_django_plugin.django.settings_types`
+                return [self._new_dependency(settings_types_module, PRI_MED)]
+            if self.plugin_config.settings_type_snapshot:
+                # Types of settings come from their runtime values, see `settings.get_type_of_settings_attribute`
+                return []
             return [self._new_dependency(self.django_context.django_settings_module, PRI_MED)]
 
         # for values / values_list
@@ -108,42 +230,36 @@ class NewSemanalDjangoPlugin(Plugin):
 
         # for `get_user_model()`
         if file.fullname == "django.contrib.auth" or file.fullname in {"django.http", "django.http.request"}:
-            auth_user_model_name = self.django_context.settings.AUTH_USER_MODEL
-            try:
-                auth_user_module = self.django_context.apps_registry.get_model(auth_user_model_name).__module__
-            except LookupError:
+            auth_user_module = self.django_context.auth_user_model_module
+            if auth_user_module is None:
                 # get_user_model() model app is not installed
                 return []
             return [self._new_dependency(auth_user_module), self._new_dependency("django_stubs_ext")]
 
+        # Bundled typeshed stubs never define models, don't initialize Django for them
+        if file.path.startswith(_TYPESHED_DIR):
+            return []
+
         deps: set[tuple[int, str, int]] = set()
 
-        # A file using `apps.get_model()` may depend on any model module.
+        # A file using `apps.get_model()` depends on the modules of the models it refers to.
         # Skip stubs to keep Django's own build graph untouched.
         if not file.is_stub and self._file_imports_apps_module(file):
             deps.update(
-                self._new_dependency(module) for module in self.django_context.model_modules if module != file.fullname
+                self._new_dependency(module) for module in self._get_model_modules(file) if module != file.fullname
             )
 
+        # Only files that may define models need the schema, others don't initialize Django
+        if not self._file_may_define_models(file):
+            return list(deps)
+
         # ensure that all mentions to='someapp.SomeModel' are loaded with corresponding related Fields
-        defined_model_classes = self.django_context.model_modules.get(file.fullname)
-        if not defined_model_classes:
+        if file.fullname not in self.django_context.model_module_names:
             return list(deps)
 
-        for model_class in defined_model_classes.values():
-            for field in itertools.chain(
-                # forward relations
-                self.django_context.get_model_related_fields(model_class),
-                # reverse relations - `related_objects` is private API (according to docstring)
-                model_class._meta.related_objects,
-            ):
-                try:
-                    related_model_cls = self.django_context.get_field_related_model_cls(field)  # type: ignore[arg-type]
-                except UnregisteredModelError:
-                    continue
-                related_model_module = related_model_cls.__module__
-                if related_model_module != file.fullname:
-                    deps.add(self._new_dependency(related_model_module))
+        deps.update(
+            self._new_dependency(module) for module in self.django_context.get_related_model_modules(file.fullname)
+        )
 
         return [
             *deps,
@@ -160,20 +276,21 @@ class NewSemanalDjangoPlugin(Plugin):
         info = self._get_typeinfo_or_none(fullname)
         if not info:
             return None
+        class_roles = self.class_roles.get(info)
 
-        if info.has_base(fullnames.FIELD_FULLNAME):
+        if class_roles & roles.FIELD:
             return partial(fields.transform_into_proper_return_type, django_context=self.django_context)
 
-        if helpers.is_model_type(info):
+        if class_roles & roles.MODEL:
             return partial(init_create.typecheck_model_init, django_context=self.django_context)
 
-        if info.has_base(fullnames.BASE_MANAGER_CLASS_FULLNAME):
+        if class_roles & roles.BASE_MANAGER:
             return querysets.determine_proper_manager_type
 
-        if info.has_base(fullnames.PREFETCH_CLASS_FULLNAME):
+        if class_roles & roles.PREFETCH:
             return partial(querysets.specialize_prefetch_type, django_context=self.django_context)
 
-        if info.has_base(fullnames.FUNC_EXPRESSION_FULLNAME):
+        if class_roles & roles.FUNC_EXPRESSION:
             return querysets.reparameterize_func_output_field
 
         return None
@@ -246,31 +363,32 @@ class NewSemanalDjangoPlugin(Plugin):
         info = self._get_typeinfo_or_none(class_fullname)
         if not info:
             return None
+        class_roles = self.class_roles.get(info)
 
-        if class_fullname.endswith("QueryDict") and info.has_base(fullnames.QUERYDICT_CLASS_FULLNAME):
+        if class_fullname.endswith("QueryDict") and class_roles & roles.QUERYDICT:
             return check_querydict_is_mutable
 
-        if method_name in self.manager_and_queryset_method_hooks and helpers.has_any_of_bases(
-            info, [fullnames.QUERYSET_CLASS_FULLNAME, fullnames.MANAGER_CLASS_FULLNAME]
-        ):
+        if method_name in self.manager_and_queryset_method_hooks and class_roles & (roles.QUERYSET | roles.MANAGER):
             return self.manager_and_queryset_method_hooks[method_name]
 
-        if method_name in ("save", "asave") and helpers.is_model_type(info):
+        if method_name in ("save", "asave") and class_roles & roles.MODEL:
             return partial(save.validate_save_update_fields, django_context=self.django_context, method=method_name)
 
-        if method_name == "get_field" and info.has_base(fullnames.OPTIONS_CLASS_FULLNAME):
+        if method_name == "get_field" and class_roles & roles.OPTIONS:
             return partial(meta.return_proper_field_type_from_get_field, django_context=self.django_context)
 
         if (
             method_name == "get_model"
-            and info.has_base(fullnames.APPS_FULLNAME)
+            and class_roles & roles.APPS
             # `StateApps` returns historical models rebuilt from migration state whose fields
             # differ from the current definitions, so narrowing to the current model is wrong.
-            and not info.has_base(fullnames.STATE_APPS_FULLNAME)
+            and not class_roles & roles.STATE_APPS
         ):
             return partial(apps.resolve_model_for_get_model, django_context=self.django_context)
 
-        if helpers.has_any_of_bases(info, [fullnames.QUERYSET_CLASS_FULLNAME, fullnames.MANAGER_CLASS_FULLNAME]):
+        if class_roles & (roles.QUERYSET | roles.MANAGER) and self.class_roles.method_may_return_annotations(
+            info, method_name
+        ):
             return partial(querysets.merge_annotations_from_custom_method, django_context=self.django_context)
 
         return None
@@ -280,14 +398,15 @@ class NewSemanalDjangoPlugin(Plugin):
         info = self._get_typeinfo_or_none(fullname)
         if not info:
             return None
+        class_roles = self.class_roles.get(info)
 
-        if info.has_base(fullnames.BASE_MANAGER_CLASS_FULLNAME):
+        if class_roles & roles.BASE_MANAGER:
             return reparametrize_any_manager_hook
 
-        if info.has_base(fullnames.QUERYSET_CLASS_FULLNAME):
+        if class_roles & roles.QUERYSET:
             return reparametrize_any_queryset_hook
 
-        if info.has_base(fullnames.FIELD_FULLNAME):
+        if class_roles & roles.FIELD:
             return reparametrize_any_field_hook
 
         return None
@@ -303,17 +422,18 @@ class NewSemanalDjangoPlugin(Plugin):
         info = self._get_typeinfo_or_none(fullname)
         if not info:
             return None
+        class_roles = self.class_roles.get(info)
 
         # Base class is a Model class definition
-        if helpers.is_model_type(info):
+        if class_roles & roles.MODEL:
             return partial(process_model_class, django_context=self.django_context)
 
         # Base class is a Form class definition
-        if info.has_base(fullnames.BASEFORM_CLASS_FULLNAME):
+        if class_roles & roles.BASEFORM:
             return forms.make_meta_nested_class_inherit_from_any
 
         # Base class is a QuerySet class definition
-        if info.has_base(fullnames.QUERYSET_CLASS_FULLNAME):
+        if class_roles & roles.QUERYSET:
             return add_as_manager_to_queryset_class
         return None
 
@@ -332,30 +452,28 @@ class NewSemanalDjangoPlugin(Plugin):
         info = self._get_typeinfo_or_none(class_name)
         if not info:
             return None
+        class_roles = self.class_roles.get(info)
 
         # Lookup of the '.is_superuser' attribute
-        if info.has_base(fullnames.PERMISSION_MIXIN_CLASS_FULLNAME) and attr_name == "is_superuser":
+        if class_roles & roles.PERMISSION_MIXIN and attr_name == "is_superuser":
             return partial(set_auth_user_model_boolean_fields, django_context=self.django_context)
 
         # Lookup of the 'user.is_staff' or 'user.is_active' attribute
-        if info.has_base(fullnames.ABSTRACT_USER_MODEL_FULLNAME) and attr_name in ("is_staff", "is_active"):
+        if class_roles & roles.ABSTRACT_USER and attr_name in ("is_staff", "is_active"):
             return partial(set_auth_user_model_boolean_fields, django_context=self.django_context)
 
         # Lookup of a method on a dynamically generated manager class
         # i.e. a manager class only existing while mypy is running, not collected from the AST
-        if info.has_base(
-            fullnames.BASE_MANAGER_CLASS_FULLNAME
-        ) and "from_queryset_manager" in helpers.get_django_metadata(info):
-            return resolve_manager_method
+        if class_roles & roles.BASE_MANAGER and "from_queryset_manager" in helpers.get_django_metadata(info):
+            return partial(resolve_manager_method, django_context=self.django_context)
 
-        if info.has_base(fullnames.STR_PROMISE_FULLNAME):
+        if class_roles & roles.STR_PROMISE:
             return resolve_str_promise_attribute
 
         if (
-            info.has_base(fullnames.CHOICES_TYPE_METACLASS_FULLNAME)
-            and attr_name in {"choices", "labels", "values", "__empty__"}
-        ) or (info.has_base(fullnames.CHOICES_CLASS_FULLNAME) and attr_name in {"label", "value"}):
-            return choices.transform_into_proper_attr_type
+            class_roles & roles.CHOICES_TYPE_METACLASS and attr_name in {"choices", "labels", "values", "__empty__"}
+        ) or (class_roles & roles.CHOICES and attr_name in {"label", "value"}):
+            return partial(choices.transform_into_proper_attr_type, django_context=self.django_context)
 
         return None
 
@@ -373,30 +491,59 @@ class NewSemanalDjangoPlugin(Plugin):
         class_name, _, method_name = fullname.rpartition(".")
         if method_name == "from_queryset":
             info = self._get_typeinfo_or_none(class_name)
-            if info and info.has_base(fullnames.BASE_MANAGER_CLASS_FULLNAME):
-                return create_new_manager_class_from_from_queryset_method
+            if info and self.class_roles.get(info) & roles.BASE_MANAGER:
+                return partial(create_new_manager_class_from_from_queryset_method, django_context=self.django_context)
         return None
 
     @cached_property
     def _report_config_data(self) -> dict[str, Any]:
-        # Cache would be cleared if any settings do change.
+        # Cache of every module would be cleared if any of these change.
         extra_data = {
-            # The additional deps depend on the installed apps
-            "INSTALLED_APPS": list(self.django_context.settings.INSTALLED_APPS),
-            # The user model determines the `_User` alias expansion
-            "AUTH_USER_MODEL": self.django_context.settings.AUTH_USER_MODEL,
-            # The implicit `pk` field type depends on `DEFAULT_AUTO_FIELD`
-            "DEFAULT_AUTO_FIELD": self.django_context.settings.DEFAULT_AUTO_FIELD,
+            # The user model determines the `_User` alias expansion and the deps for `get_user_model()`
+            "AUTH_USER_MODEL": self.django_context.schema_settings["AUTH_USER_MODEL"],
+            "contrib_auth_installed": "django.contrib.auth" in self.django_context.schema_settings["INSTALLED_APPS"],
             "django_version": _package_version("django"),
             "django_stubs_version": _package_version("django-stubs"),
         }
+        if self.django_context.snapshot_path is None:
+            # Without the per-module digests of the snapshot, the additional deps depend on the installed apps
+            extra_data["INSTALLED_APPS"] = list(self.django_context.schema_settings["INSTALLED_APPS"])
+            # The implicit `pk` field type depends on `DEFAULT_AUTO_FIELD`
+            extra_data["DEFAULT_AUTO_FIELD"] = self.django_context.schema_settings["DEFAULT_AUTO_FIELD"]
+        if self.plugin_config.settings_type_snapshot and self.plugin_config.settings_types_module is None:
+            # `settings.<NAME>` types come from the runtime values of the settings
+            extra_data["setting_types"] = self.django_context.get_setting_types_digest()
         if (django_stubs_ext_version := _package_version("django-stubs-ext")) is not None:
             extra_data["django_stubs_ext_version"] = django_stubs_ext_version
         return self.plugin_config.to_json(extra_data)
 
+    def _get_module_config_data(self, module: str, path: str | None) -> dict[str, Any]:
+        """Parts of the Django schema a single module depends on, so that other changes keep its cache.
+
+        Only available with a schema snapshot: otherwise, reading the schema would boot Django for every run.
+        """
+        if self.django_context.snapshot_path is None or path is None or path.startswith(_TYPESHED_DIR):
+            return {}
+        # Fields, relations and dependencies of models defined in the module
+        if (models_digest := self.django_context.get_model_module_digest(module)) is not None:
+            return {"models": models_digest}
+        return {}
+
     @override
     def report_config_data(self, ctx: ReportConfigContext) -> dict[str, Any]:
-        return self._report_config_data
+        return {**self._report_config_data, **self._get_module_config_data(ctx.id, ctx.path)}
+
+
+def _nested_blocks(statement: IfStmt | ForStmt | WhileStmt | WithStmt | TryStmt) -> list[Block]:
+    if isinstance(statement, IfStmt):
+        blocks = [*statement.body, statement.else_body]
+    elif isinstance(statement, TryStmt):
+        blocks = [statement.body, *statement.handlers, statement.else_body, statement.finally_body]
+    elif isinstance(statement, WithStmt):
+        blocks = [statement.body]
+    else:
+        blocks = [statement.body, statement.else_body]
+    return [block for block in blocks if block is not None]
 
 
 @cache
@@ -2,13 +2,15 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from mypy.nodes import StrExpr
+from mypy.nodes import ARG_POS, CallExpr, ImportFrom, MemberExpr, NameExpr, StrExpr
+from mypy.server.subexpr import get_subexpressions
 from mypy.types import Instance, TypeType
 from mypy.types import Type as MypyType
 
 from mypy_django_plugin.lib import helpers
 
 if TYPE_CHECKING:
+    from mypy.nodes import Expression, MypyFile
     from mypy.plugin import MethodContext
 
     from mypy_django_plugin.django.context import DjangoContext
@@ -54,3 +56,48 @@ def resolve_model_for_get_model(ctx: MethodContext, django_context: DjangoContex
     ):
         return TypeType(Instance(model_info, []))
     return ctx.default_return_type
+
+
+def find_get_model_references(file: MypyFile) -> set[str] | None:
+    """Collect the `<app_label>.<model_name>` references of all `get_model()` calls in a parsed file.
+
+    Run before the file is analyzed, so calls are recognized by name. Returns `None` when unsure, that is
+    when `get_model` is referred to anywhere without being called with literal positional arguments:
+
+        apps.get_model("myapp.MyModel")       # -> {"myapp.MyModel"}
+        apps.get_model(app_label, "MyModel")  # -> None
+    """
+    # Calls through an alias like `from ... import get_model as load_model` aren't recognized
+    for import_node in file.imports:
+        if isinstance(import_node, ImportFrom) and any(
+            name == "get_model" and alias not in (None, name) for name, alias in import_node.names
+        ):
+            return None
+
+    lazy_references = set()
+    # mypy's traverser visitors can't be subclassed by interpreted code, `get_subexpressions` walks the tree
+    expressions = get_subexpressions(file)
+    called = set()
+    for expr in expressions:
+        if isinstance(expr, CallExpr) and _is_get_model_name(expr.callee):
+            lazy_reference = _literal_lazy_reference(expr)
+            if lazy_reference is None:
+                return None
+            lazy_references.add(lazy_reference)
+            called.add(id(expr.callee))
+    for expr in expressions:
+        if _is_get_model_name(expr) and id(expr) not in called:
+            return None
+    return lazy_references
+
+
+def _is_get_model_name(expr: Expression) -> bool:
+    return isinstance(expr, (NameExpr, MemberExpr)) and expr.name == "get_model"
+
+
+def _literal_lazy_reference(call: CallExpr) -> str | None:
+    """`get_model("app_label.ModelName")` or `get_model("app_label", "ModelName")`."""
+    if not 1 <= len(call.args) <= 2 or any(kind != ARG_POS for kind in call.arg_kinds):
+        return None
+    parts = [arg.value for arg in call.args if isinstance(arg, StrExpr)]
+    return ".".join(parts) if len(parts) == len(call.args) else None
@@ -21,11 +21,13 @@ from mypy.types import (
 )
 from mypy.types import Type as MypyType
 
-from mypy_django_plugin.lib import fullnames
+from mypy_django_plugin.lib import fullnames, helpers
 
 if TYPE_CHECKING:
     from mypy.plugin import AttributeContext
 
+    from mypy_django_plugin.django.context import DjangoContext
+
 
 # TODO: [mypy 1.14+] Remove this backport of `TypeInfo.enum_members`.
 def _get_enum_members(info: TypeInfo) -> list[str]:
@@ -102,6 +104,25 @@ def _label_laziness(node: TypeInfo) -> _LabelLaziness:
     return _LabelLaziness.make(lazy)
 
 
+def _get_label_laziness(node: TypeInfo) -> tuple[_LabelLaziness, bool]:
+    """
+    The laziness of the labels of a choices type, and whether it is final.
+
+    It is final once the types of all members are inferred, then it is stored in the metadata of the
+    choices type, so that the members are only inspected once.
+    """
+    metadata = helpers.get_django_metadata(node)
+    if (stored := metadata.get("choices_label_laziness")) is not None:
+        return _LabelLaziness[stored], True
+
+    label_laziness = _label_laziness(node)
+    member_names = ["__empty__", *_get_enum_members(node)] if "__empty__" in node.names else _get_enum_members(node)
+    if all((sym := node.get(member_name)) is not None and sym.type is not None for member_name in member_names):
+        metadata["choices_label_laziness"] = label_laziness.name
+        return label_laziness, True
+    return label_laziness, False
+
+
 def _try_replace_label(typ: ProperType, label_laziness: _LabelLaziness) -> MypyType:
     """
     Attempt to replace a label with a modified version.
@@ -154,20 +175,23 @@ def _get_enum_type_from_union_of_literals(typ: UnionType) -> MypyType:
 
     If this cannot be resolved, the original is returned.
     """
-    types = set()
+    enum_type: Instance | None = None
 
     for item in typ.items:
         item = get_proper_type(item)
         if not isinstance(item, LiteralType) or not item.fallback.type.is_enum:
             # If anything that isn't a literal of an enum type is encountered, return the original.
             return typ
-        types.add(item.fallback)
+        if enum_type is None:
+            enum_type = item.fallback
+        elif item.fallback is not enum_type and item.fallback != enum_type:
+            # If there is more than one enum type, return the original.
+            return typ
 
-    # If there is only one enum type seen, return that otherwise return the original.
-    return types.pop() if len(types) == 1 else typ
+    return enum_type if enum_type is not None else typ
 
 
-def transform_into_proper_attr_type(ctx: AttributeContext) -> MypyType:
+def transform_into_proper_attr_type(ctx: AttributeContext, django_context: DjangoContext) -> MypyType:
     """
     A `get_attribute_hook` to make `.choices` and `.values` optional if `__empty__` is defined.
 
@@ -231,6 +255,27 @@ def transform_into_proper_attr_type(ctx: AttributeContext) -> MypyType:
     if not node.is_enum or not node.has_base(fullnames.CHOICES_CLASS_FULLNAME):
         return default_attr_type
 
+    attr_type = django_context.choices_attr_types.get(node, name, default_attr_type)
+    if attr_type is not None:
+        return attr_type
+
+    # When `__empty__` is not a lazy string and the labels on all members are not lazy strings, the
+    # label can be simplified to only be a simple string type. This keeps the benefits of accurate
+    # typing when the lazy labels are being used, but reduces the pain of having to manage a union
+    # of a simple and lazy string type where it's not necessary.
+    label_laziness, is_final = _get_label_laziness(node)
+    attr_type = _get_proper_attr_type(node, name, default_attr_type, label_laziness)
+    if is_final:
+        django_context.choices_attr_types.set(node, name, default_attr_type, attr_type)
+    return attr_type
+
+
+def _get_proper_attr_type(
+    node: TypeInfo, name: str, default_attr_type: ProperType, label_laziness: _LabelLaziness
+) -> MypyType:
+    """
+    Amend the default type of the attribute `name` of the choices type `node`.
+    """
     # Enums with more than one base will treat the first base as the mixed-in type.
     base_type = node.bases[0] if len(node.bases) > 1 else None
 
@@ -238,12 +283,6 @@ def transform_into_proper_attr_type(ctx: AttributeContext) -> MypyType:
     # the blank choice which is labelled by the value of `__empty__`.
     empty_label = node.get("__empty__")
 
-    # When `__empty__` is not a lazy string and the labels on all members are not lazy strings, the
-    # label can be simplified to only be a simple string type. This keeps the benefits of accurate
-    # typing when the lazy labels are being used, but reduces the pain of having to manage a union
-    # of a simple and lazy string type where it's not necessary.
-    label_laziness = _label_laziness(node)
-
     if (
         name == "choices"
         and isinstance(default_attr_type, Instance)
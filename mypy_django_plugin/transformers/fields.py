@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING, NamedTuple, cast
 from django.core.exceptions import FieldDoesNotExist
 from django.db.models.fields import AutoField
 from django.db.models.fields.related import RelatedField
-from mypy.nodes import AssignmentStmt, NameExpr, TypeInfo
+from mypy.nodes import NameExpr, TypeInfo
 from mypy.types import AnyType, Instance, NoneType, ProperType, TypeOfAny, UninhabitedType, UnionType, get_proper_type
 from mypy.types import Type as MypyType
 
@@ -25,16 +25,10 @@ def _get_current_field_from_assignment(ctx: FunctionContext, django_context: Dja
     if outer_model_info is None or not helpers.is_model_type(outer_model_info):
         return None
 
-    field_name = None
-    for stmt in outer_model_info.defn.defs.body:
-        if isinstance(stmt, AssignmentStmt):
-            if stmt.rvalue == ctx.context:
-                if not isinstance(stmt.lvalues[0], NameExpr):
-                    return None
-                field_name = stmt.lvalues[0].name
-                break
-    if field_name is None:
+    stmt = django_context.class_bodies.get(outer_model_info.defn).assignment_of(ctx.context)
+    if stmt is None or not isinstance(stmt.lvalues[0], NameExpr):
         return None
+    field_name = stmt.lvalues[0].name
 
     model_cls = django_context.get_model_class_by_fullname(outer_model_info.fullname)
     if model_cls is None:
@@ -73,15 +67,14 @@ def fill_descriptor_types_for_related_field(ctx: FunctionContext, django_context
     if current_model_cls._meta.abstract and current_model_cls == related_model_cls:
         # for all derived non-abstract classes, set variable with this name to
         # __get__/__set__ of ForeignKey of derived model
-        for model_cls in django_context.all_registered_model_classes:
-            if issubclass(model_cls, current_model_cls) and not model_cls._meta.abstract:
-                derived_model_info = helpers.lookup_class_typeinfo(helpers.get_typechecker_api(ctx), model_cls)
-                if derived_model_info is not None:
-                    fk_ref_type = Instance(derived_model_info, [])
-                    derived_fk_type = reparametrize_related_field_type(
-                        default_related_field_type, set_type=fk_ref_type, get_type=fk_ref_type
-                    )
-                    helpers.add_new_sym_for_info(derived_model_info, name=current_field.name, sym_type=derived_fk_type)
+        for model_cls in django_context.get_concrete_descendants(current_model_cls):
+            derived_model_info = helpers.lookup_class_typeinfo(helpers.get_typechecker_api(ctx), model_cls)
+            if derived_model_info is not None:
+                fk_ref_type = Instance(derived_model_info, [])
+                derived_fk_type = reparametrize_related_field_type(
+                    default_related_field_type, set_type=fk_ref_type, get_type=fk_ref_type
+                )
+                helpers.add_new_sym_for_info(derived_model_info, name=current_field.name, sym_type=derived_fk_type)
 
     related_model = related_model_cls
     related_model_to_set = related_model_cls
@@ -30,6 +30,9 @@ if TYPE_CHECKING:
     from mypy.plugin import AttributeContext, ClassDefContext, DynamicClassDefContext
     from mypy.semanal import SemanticAnalyzer
 
+    from mypy_django_plugin.django.context import DjangoContext
+    from mypy_django_plugin.lib.caches import DynamicManagerMethodCache
+
 MANAGER_METHODS_RETURNING_QUERYSET: Final = frozenset(
     (
         "alias",
@@ -57,7 +60,10 @@ MANAGER_METHODS_RETURNING_QUERYSET: Final = frozenset(
 
 
 def get_method_type_from_dynamic_manager(
-    api: TypeChecker, method_name: str, manager_instance: Instance
+    api: TypeChecker,
+    method_name: str,
+    manager_instance: Instance,
+    method_cache: DynamicManagerMethodCache | None = None,
 ) -> ProperType | None:
     """
     Attempt to resolve a method on a manager that was built from '.from_queryset'
@@ -80,6 +86,14 @@ def get_method_type_from_dynamic_manager(
 
     manager_model = get_proper_type(find_member("model", manager_instance, manager_instance))
     assert isinstance(manager_model, TypeType), manager_model
+    # Only managers of a model class are cached, not e.g. of a type variable
+    model_info = None
+    if isinstance(manager_model.item, Instance) and not manager_model.item.args:
+        model_info = manager_model.item.type
+    if method_cache is not None and model_info is not None:
+        cached_method_type = method_cache.get(manager_instance.type, model_info, queryset_info, method_name)
+        if cached_method_type is not None:
+            return cached_method_type
 
     # Resolve the method as if it was accessed on the queryset, parametrized with the manager's model.
     queryset_instance = Instance(queryset_info, (manager_model.item,) * len(queryset_info.type_vars))
@@ -93,7 +107,12 @@ def get_method_type_from_dynamic_manager(
     ):
         method_type = method_proper_type.copy_modified(ret_type=queryset_instance)
 
-    return get_proper_type(method_type) if method_type is not None else None
+    if method_type is None:
+        return None
+    method_proper_type = get_proper_type(method_type)
+    if method_cache is not None and model_info is not None:
+        method_cache.set(manager_instance.type, model_info, queryset_info, method_name, method_proper_type)
+    return method_proper_type
 
 
 def _get_funcdef_type(definition: Node | None) -> ProperType | None:
@@ -104,13 +123,15 @@ def _get_funcdef_type(definition: Node | None) -> ProperType | None:
     return None
 
 
-def resolve_manager_method_from_instance(instance: Instance, method_name: str, ctx: AttributeContext) -> MypyType:
+def resolve_manager_method_from_instance(
+    instance: Instance, method_name: str, ctx: AttributeContext, django_context: DjangoContext
+) -> MypyType:
     api = helpers.get_typechecker_api(ctx)
-    method_type = get_method_type_from_dynamic_manager(api, method_name, instance)
+    method_type = get_method_type_from_dynamic_manager(api, method_name, instance, django_context.manager_methods)
     return method_type if method_type is not None else ctx.default_attr_type
 
 
-def resolve_manager_method(ctx: AttributeContext) -> MypyType:
+def resolve_manager_method(ctx: AttributeContext, django_context: DjangoContext) -> MypyType:
     """
     A 'get_attribute_hook' that is intended to be invoked whenever the TypeChecker encounters
     an attribute on a class that has 'django.db.models.BaseManager' as a base.
@@ -133,10 +154,14 @@ def resolve_manager_method(ctx: AttributeContext) -> MypyType:
         return AnyType(TypeOfAny.from_error)
 
     if isinstance(ctx.type, Instance):
-        return resolve_manager_method_from_instance(instance=ctx.type, method_name=method_name, ctx=ctx)
+        return resolve_manager_method_from_instance(
+            instance=ctx.type, method_name=method_name, ctx=ctx, django_context=django_context
+        )
     if isinstance(ctx.type, UnionType) and all(isinstance(get_proper_type(item), Instance) for item in ctx.type.items):
         resolved = tuple(
-            resolve_manager_method_from_instance(instance=instance, method_name=method_name, ctx=ctx)
+            resolve_manager_method_from_instance(
+                instance=instance, method_name=method_name, ctx=ctx, django_context=django_context
+            )
             for item in ctx.type.items
             if isinstance((instance := get_proper_type(item)), Instance)
         )
@@ -145,7 +170,9 @@ def resolve_manager_method(ctx: AttributeContext) -> MypyType:
     return AnyType(TypeOfAny.from_error)
 
 
-def create_new_manager_class_from_from_queryset_method(ctx: DynamicClassDefContext) -> None:
+def create_new_manager_class_from_from_queryset_method(
+    ctx: DynamicClassDefContext, django_context: DjangoContext
+) -> None:
     """
     Insert a new manager class node for a: '<Name> = <Manager>.from_queryset(<QuerySet>)'.
     When the assignment expression lives at module level.
@@ -173,7 +200,11 @@ def create_new_manager_class_from_from_queryset_method(ctx: DynamicClassDefConte
                 # XXX: hack for python/mypy#17402
                 ph = PlaceholderNode(ctx.api.qualified_name(ctx.name), ctx.call, ctx.call.line, becomes_typeinfo=True)
                 ctx.api.add_symbol_table_node(ctx.name, SymbolTableNode(GDEF, ph))
-            ctx.api.defer()
+            django_context.deferrals.defer(
+                semanal_api,
+                "create_new_manager_class_from_from_queryset_method",
+                "Manager or queryset of 'from_queryset()' not analyzed yet",
+            )
         return
 
 
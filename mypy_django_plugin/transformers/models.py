@@ -2,9 +2,8 @@ from __future__ import annotations
 
 from collections import deque
 from functools import cached_property
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, ClassVar, cast
 
-from django.db.models.fields import DateField, DateTimeField, Field
 from django.db.models.fields.reverse_related import ForeignObjectRel, ManyToManyRel, OneToOneRel
 from mypy.nodes import (
     ARG_STAR2,
@@ -43,16 +42,20 @@ if TYPE_CHECKING:
     from collections.abc import Iterable
 
     from django.db.models import Manager, Model
+    from django.db.models.fields import Field
     from mypy.checker import TypeChecker
-    from mypy.nodes import MypyFile
+    from mypy.nodes import ClassDef, MypyFile
     from mypy.plugin import AnalyzeTypeContext, AttributeContext, ClassDefContext
 
     from mypy_django_plugin.config import DjangoPluginConfig
     from mypy_django_plugin.django.context import DjangoContext
+    from mypy_django_plugin.lib.caches import ClassCallCache
 
 
 class ModelClassInitializer:
     api: SemanticAnalyzer
+    # Initializers whose changes don't survive another semantic analysis pass of the model class
+    run_on_every_pass: ClassVar[bool] = False
 
     def __init__(self, ctx: ClassDefContext, django_context: DjangoContext) -> None:
         self.api = cast("SemanticAnalyzer", ctx.api)
@@ -256,6 +259,9 @@ class InjectAnyAsBaseForNestedMeta(ModelClassInitializer):
     to get around incompatible Meta inner classes for different models.
     """
 
+    # mypy computes the MRO of the nested class again on every pass
+    run_on_every_pass = True
+
     @override
     def run(self) -> None:
         meta_node = helpers.get_nested_meta_node_for_current_class(self.model_classdef.info)
@@ -404,7 +410,9 @@ class AddManagers(ModelClassInitializer):
             if not self.api.final_iteration:
                 #  Unless we're on the final round, see if another round could
                 #  figure out all manager types
-                raise helpers.IncompleteDefnException()
+                raise helpers.IncompleteDefnException(
+                    f"Unresolved manager types: {', '.join(sorted(incomplete_manager_defs))}"
+                )
 
             for manager_name in incomplete_manager_defs:
                 # We act graceful and set the type as the bare minimum we know of
@@ -428,15 +436,7 @@ class AddManagers(ModelClassInitializer):
 
     def get_manager_expression(self, name: str) -> AssignmentStmt | None:
         # TODO: What happens if the manager is defined multiple times?
-        for expr in self.ctx.cls.defs.body:
-            if (
-                isinstance(expr, AssignmentStmt)
-                and isinstance(expr.lvalues[0], NameExpr)
-                and expr.lvalues[0].name == name
-            ):
-                return expr
-
-        return None
+        return self.django_context.class_bodies.get(self.ctx.cls).assignment_to(name)
 
     def get_dynamic_manager(self, fullname: str, manager: Manager[Any]) -> TypeInfo | None:
         """
@@ -480,6 +480,10 @@ class AddDefaultManagerAttribute(ModelClassInitializer):
         if "_default_manager" in self.model_classdef.info.names:
             return None
 
+        if model_cls._meta.default_manager is None:
+            # Abstract models without managers
+            return None
+
         default_manager_cls = model_cls._meta.default_manager.__class__
         default_manager_fullname = helpers.get_class_fullname(default_manager_cls)
 
@@ -562,7 +566,7 @@ class AddReverseLookups(ModelClassInitializer):
         default_manager = to_model_info.names.get("_default_manager")
         if default_manager is None:
             if not self.api.final_iteration:
-                raise helpers.IncompleteDefnException()
+                raise helpers.IncompleteDefnException(f"No '_default_manager' on {to_model_info.fullname!r} yet")
             # When we get no default manager we can't customize the reverse manager any
             # further and will just fall back to the manager declared on the descriptor.
             # If a django model has a Manager class that cannot be resolved statically
@@ -615,57 +619,56 @@ class AddReverseLookups(ModelClassInitializer):
     @override
     def run_with_model_cls(self, model_cls: type[Model]) -> None:
         # add related managers etc.
-        processing_incomplete = False
+        incomplete: helpers.IncompleteDefnException | None = None
         for relation in self.django_context.get_model_relations(model_cls):
             try:
                 self.process_relation(relation)
-            except helpers.IncompleteDefnException:
-                processing_incomplete = True
+            except helpers.IncompleteDefnException as exc:
+                incomplete = incomplete or exc
 
-        if processing_incomplete and not self.api.final_iteration:
-            raise helpers.IncompleteDefnException
+        if incomplete is not None and not self.api.final_iteration:
+            raise incomplete
 
 
 class AddExtraFieldMethods(ModelClassInitializer):
     @override
     def run_with_model_cls(self, model_cls: type[Model]) -> None:
+        model_schema = self.django_context.get_model_schema(model_cls)
         # get_FOO_display for choices
-        for field in self.django_context.get_model_fields(model_cls):
-            if field.choices:
-                info = self.lookup_typeinfo_or_incomplete_defn_error("builtins.str")
-                return_type = Instance(info, [])
-                common.add_method(self.ctx, name=f"get_{field.attname}_display", args=[], return_type=return_type)
+        for field in model_schema.choice_fields:
+            info = self.lookup_typeinfo_or_incomplete_defn_error("builtins.str")
+            return_type = Instance(info, [])
+            common.add_method(self.ctx, name=f"get_{field.attname}_display", args=[], return_type=return_type)
 
         # get_next_by, get_previous_by for Date, DateTime
-        for field in self.django_context.get_model_fields(model_cls):
-            if isinstance(field, DateField | DateTimeField) and not field.null:
-                return_type = Instance(self.model_classdef.info, [])
-                common.add_method(
-                    self.ctx,
-                    name=f"get_next_by_{field.attname}",
-                    args=[
-                        Argument(
-                            Var("kwargs", AnyType(TypeOfAny.implementation_artifact)),
-                            AnyType(TypeOfAny.implementation_artifact),
-                            initializer=None,
-                            kind=ARG_STAR2,
-                        )
-                    ],
-                    return_type=return_type,
-                )
-                common.add_method(
-                    self.ctx,
-                    name=f"get_previous_by_{field.attname}",
-                    args=[
-                        Argument(
-                            Var("kwargs", AnyType(TypeOfAny.implementation_artifact)),
-                            AnyType(TypeOfAny.implementation_artifact),
-                            initializer=None,
-                            kind=ARG_STAR2,
-                        )
-                    ],
-                    return_type=return_type,
-                )
+        for field in model_schema.date_fields:
+            return_type = Instance(self.model_classdef.info, [])
+            common.add_method(
+                self.ctx,
+                name=f"get_next_by_{field.attname}",
+                args=[
+                    Argument(
+                        Var("kwargs", AnyType(TypeOfAny.implementation_artifact)),
+                        AnyType(TypeOfAny.implementation_artifact),
+                        initializer=None,
+                        kind=ARG_STAR2,
+                    )
+                ],
+                return_type=return_type,
+            )
+            common.add_method(
+                self.ctx,
+                name=f"get_previous_by_{field.attname}",
+                args=[
+                    Argument(
+                        Var("kwargs", AnyType(TypeOfAny.implementation_artifact)),
+                        AnyType(TypeOfAny.implementation_artifact),
+                        initializer=None,
+                        kind=ARG_STAR2,
+                    )
+                ],
+                return_type=return_type,
+            )
 
 
 class ProcessManyToManyFields(ModelClassInitializer):
@@ -681,26 +684,42 @@ class ProcessManyToManyFields(ModelClassInitializer):
           makes sense to add it when processing ManyToManyField
     """
 
-    def statements(self) -> Iterable[Statement]:
+    def model_classdefs(self) -> Iterable[ClassDef]:
         """
-        Returns class body statements from the current model and any of its bases that
-        is an abstract model. Statements from any concrete parent class or parents of
-        that concrete class will be skipped.
+        Returns the class definitions of the current model and any of its bases that is
+        an abstract model. Any concrete parent class or parents of that concrete class
+        will be skipped.
+
+        The abstract bases of models known to Django are computed once per model by `DjangoContext`.
         """
+        model_cls = self.django_context.get_model_class_by_fullname(self.model_classdef.fullname)
+        if model_cls is not None:
+            abstract_bases = [
+                self.lookup_typeinfo(helpers.get_class_fullname(base_cls))
+                for base_cls in self.django_context.get_abstract_model_bases(model_cls)
+            ]
+            if all(base_info is not None for base_info in abstract_bases):
+                yield self.model_classdef
+                for base_info in abstract_bases:
+                    if base_info is not None:
+                        yield base_info.defn
+                return
+
+        # Unknown to Django, or a base class mypy can't find by its runtime name
         processed_models = set()
-        # Produce all statements from current class
+        # Produce the current class
         model_bases = deque([self.model_classdef])
         # Do a breadth first search over the current model and its bases, to find all
         # abstract parent models that have not been "interrupted" by any concrete model.
         while model_bases:
             model = model_bases.popleft()
-            yield from model.defs.body
+            yield model
             if isinstance(model.info, FakeInfo):
                 # While loading from cache ClassDef infos are faked and 'FakeInfo' doesn't have
                 # all attributes of a 'TypeInfo' set. See #2184
                 continue
             for base in model.info.bases:
-                # Only produce any additional statements from abstract model bases, as they
+                # Only produce additional classes from abstract model bases, as they
                 # simulate regular python inheritance. Avoid concrete models, and any of their
                 # parents, as they're handled differently by Django.
                 if helpers.is_abstract_model(base.type) and base.type.fullname not in processed_models:
@@ -713,67 +732,75 @@ class ProcessManyToManyFields(ModelClassInitializer):
             # TODO: Create abstract through models?
             return
 
-        for statement in self.statements():
-            # Check if this part of the class body is an assignment from a 'ManyToManyField' call
-            # <field> = ManyToManyField(...)
-            if (
-                isinstance(statement, AssignmentStmt)
-                and len(statement.lvalues) == 1
-                and isinstance(statement.lvalues[0], NameExpr)
-                and isinstance(statement.rvalue, CallExpr)
-                and len(statement.rvalue.args) > 0  # Need at least the 'to' argument
-                and isinstance(statement.rvalue.callee, RefExpr)
-                and isinstance(statement.rvalue.callee.node, TypeInfo)
-                and statement.rvalue.callee.node.has_base(fullnames.MANYTOMANY_FIELD_FULLNAME)
-            ):
-                m2m_field_name = statement.lvalues[0].name
-                m2m_field_symbol = self.model_classdef.info.get(m2m_field_name)
-                # The symbol referred to by the assignment expression is expected to be a variable
-                if m2m_field_symbol is None or not isinstance(m2m_field_symbol.node, Var):
-                    continue
-                # Resolve argument information of the 'ManyToManyField(...)' call
-                args = self.resolve_many_to_many_arguments(statement.rvalue, context=statement)
-                # Ignore calls without required 'to' argument, mypy will complain
-                if args is None:
-                    continue
-                # Get the names of the implicit through model that will be generated
-                through_model_name = f"{self.model_classdef.name}_{m2m_field_name}"
-                through_model = self.create_through_table_class(
-                    field_name=m2m_field_name,
-                    model_name=through_model_name,
-                    model_fullname=f"{self.model_classdef.info.module_name}.{through_model_name}",
-                    m2m_args=args,
-                )
-                if through_model is not None and args.through is None:
-                    # Explicit through models are regular models, they get their managers from the usual initializers.
-                    self.add_through_table_managers(through_model)
-
-                container = self.model_classdef.info.get_containing_type_info(m2m_field_name)
-                if (
-                    through_model is not None
-                    and container is not None
-                    and container.fullname != self.model_classdef.info.fullname
-                    and helpers.is_abstract_model(container)
-                ):
-                    # ManyToManyField is inherited from an abstract parent class, so in
-                    # order to get the to and the through model argument right we
-                    # override the ManyToManyField attribute on the current class
-                    helpers.add_new_sym_for_info(
-                        self.model_classdef.info,
-                        name=m2m_field_name,
-                        sym_type=Instance(self.m2m_field, [args.to.model, Instance(through_model, [])]),
-                    )
-                # Create a 'ManyRelatedManager' class for the processed model
-                self.create_many_related_manager(Instance(self.model_classdef.info, []))
-                if isinstance(args.to.model, Instance):
-                    # Create a 'ManyRelatedManager' class for the related model
-                    self.create_many_related_manager(args.to.model)
+        for model in self.model_classdefs():
+            for statement in model.defs.body:
+                self.process_statement(statement, declared_in=model)
+
+    def process_statement(self, statement: Statement, *, declared_in: ClassDef) -> None:
+        # Check if this part of the class body is an assignment from a 'ManyToManyField' call
+        # <field> = ManyToManyField(...)
+        if not (
+            isinstance(statement, AssignmentStmt)
+            and len(statement.lvalues) == 1
+            and isinstance(statement.lvalues[0], NameExpr)
+            and isinstance(statement.rvalue, CallExpr)
+            and len(statement.rvalue.args) > 0  # Need at least the 'to' argument
+            and isinstance(statement.rvalue.callee, RefExpr)
+            and isinstance(statement.rvalue.callee.node, TypeInfo)
+            and statement.rvalue.callee.node.has_base(fullnames.MANYTOMANY_FIELD_FULLNAME)
+        ):
+            return
+        m2m_field_name = statement.lvalues[0].name
+        m2m_field_symbol = self.model_classdef.info.get(m2m_field_name)
+        # The symbol referred to by the assignment expression is expected to be a variable
+        if m2m_field_symbol is None or not isinstance(m2m_field_symbol.node, Var):
+            return
+        # Resolve argument information of the 'ManyToManyField(...)' call
+        if declared_in is self.model_classdef:
+            args = self.resolve_many_to_many_arguments(statement.rvalue, context=statement)
+        else:
+            args = self.resolve_inherited_many_to_many_arguments(declared_in.info, statement.rvalue, context=statement)
+        # Ignore calls without required 'to' argument, mypy will complain
+        if args is None:
+            return
+        # Get the names of the implicit through model that will be generated
+        through_model_name = f"{self.model_classdef.name}_{m2m_field_name}"
+        through_model = self.create_through_table_class(
+            field_name=m2m_field_name,
+            model_name=through_model_name,
+            model_fullname=f"{self.model_classdef.info.module_name}.{through_model_name}",
+            m2m_args=args,
+        )
+        if through_model is not None and args.through is None:
+            # Explicit through models are regular models, they get their managers from the usual initializers.
+            self.add_through_table_managers(through_model)
+
+        container = self.model_classdef.info.get_containing_type_info(m2m_field_name)
+        if (
+            through_model is not None
+            and container is not None
+            and container.fullname != self.model_classdef.info.fullname
+            and helpers.is_abstract_model(container)
+        ):
+            # ManyToManyField is inherited from an abstract parent class, so in
+            # order to get the to and the through model argument right we
+            # override the ManyToManyField attribute on the current class
+            helpers.add_new_sym_for_info(
+                self.model_classdef.info,
+                name=m2m_field_name,
+                sym_type=Instance(self.m2m_field, [args.to.model, Instance(through_model, [])]),
+            )
+        # Create a 'ManyRelatedManager' class for the processed model
+        self.create_many_related_manager(Instance(self.model_classdef.info, []))
+        if isinstance(args.to.model, Instance):
+            # Create a 'ManyRelatedManager' class for the related model
+            self.create_many_related_manager(args.to.model)
 
     @cached_property
     def default_pk_instance(self) -> Instance:
-        default_pk_field = self.lookup_typeinfo(self.django_context.settings.DEFAULT_AUTO_FIELD)
-        if default_pk_field is None:
-            raise helpers.IncompleteDefnException()
+        default_pk_field = self.lookup_typeinfo_or_incomplete_defn_error(
+            self.django_context.settings.DEFAULT_AUTO_FIELD
+        )
         return Instance(
             default_pk_field,
             list(get_field_descriptor_types(default_pk_field, is_set_nullable=True, is_get_nullable=False)),
@@ -785,31 +812,19 @@ class ProcessManyToManyFields(ModelClassInitializer):
 
     @cached_property
     def model_base(self) -> TypeInfo:
-        info = self.lookup_typeinfo(fullnames.MODEL_CLASS_FULLNAME)
-        if info is None:
-            raise helpers.IncompleteDefnException()
-        return info
+        return self.lookup_typeinfo_or_incomplete_defn_error(fullnames.MODEL_CLASS_FULLNAME)
 
     @cached_property
     def fk_field(self) -> TypeInfo:
-        info = self.lookup_typeinfo(fullnames.FOREIGN_KEY_FULLNAME)
-        if info is None:
-            raise helpers.IncompleteDefnException()
-        return info
+        return self.lookup_typeinfo_or_incomplete_defn_error(fullnames.FOREIGN_KEY_FULLNAME)
 
     @cached_property
     def m2m_field(self) -> TypeInfo:
-        info = self.lookup_typeinfo(fullnames.MANYTOMANY_FIELD_FULLNAME)
-        if info is None:
-            raise helpers.IncompleteDefnException()
-        return info
+        return self.lookup_typeinfo_or_incomplete_defn_error(fullnames.MANYTOMANY_FIELD_FULLNAME)
 
     @cached_property
     def manager_info(self) -> TypeInfo:
-        info = self.lookup_typeinfo(fullnames.MANAGER_CLASS_FULLNAME)
-        if info is None:
-            raise helpers.IncompleteDefnException()
-        return info
+        return self.lookup_typeinfo_or_incomplete_defn_error(fullnames.MANAGER_CLASS_FULLNAME)
 
     @cached_property
     def fk_field_types(self) -> FieldDescriptorTypes:
@@ -944,6 +959,30 @@ class ProcessManyToManyFields(ModelClassInitializer):
 
         return M2MArguments(to=to, through=through)
 
+    def resolve_inherited_many_to_many_arguments(
+        self, abstract_model: TypeInfo, call: CallExpr, /, context: Context
+    ) -> M2MArguments | None:
+        """
+        Like `resolve_many_to_many_arguments()`, for a 'ManyToManyField(...)' call declared on an
+        abstract base. Arguments that don't depend on the current model are resolved once per call.
+        """
+        cache: ClassCallCache[M2MArguments] = self.django_context.inherited_m2m_arguments
+        args = cache.get(abstract_model, call)
+        if args is not None:
+            is_self = isinstance(args.to.model, Instance) and args.to.model.type == self.model_classdef.info
+            return args._replace(to=args.to._replace(self=is_self))
+
+        args = self.resolve_many_to_many_arguments(call, context=context)
+        if (
+            args is not None
+            # 'self' resolves to the current model
+            and not args.to.self
+            # A 'through' argument which isn't resolved yet is resolved again on the next pass
+            and (args.through is not None or helpers.get_class_init_argument_by_name(call, "through") is None)
+        ):
+            cache.set(abstract_model, call, args)
+        return args
+
     def create_many_related_manager(self, model: Instance) -> None:
         """
         Creates a generic manager that subclasses both 'ManyRelatedManager' and the
@@ -958,7 +997,7 @@ class ProcessManyToManyFields(ModelClassInitializer):
 
         default_manager_node = model.type.names.get("_default_manager")
         if default_manager_node is None:
-            raise helpers.IncompleteDefnException()
+            raise helpers.IncompleteDefnException(f"No '_default_manager' on {model.type.fullname!r} yet")
         default_manager_type = get_proper_type(default_manager_node.type)
         if not isinstance(default_manager_type, Instance):
             return
@@ -1096,12 +1135,40 @@ def process_model_class(ctx: ClassDefContext, django_context: DjangoContext) ->
         ProcessManyToManyFields,
         MetaclassAdjustments,
     ]
+    semanal_api = helpers.get_semanal_api(ctx)
+    # Initializers done on a previous pass are skipped. Nothing is recorded while the class body itself is
+    # deferred, an initializer could have silently skipped a statement referring to a placeholder.
+    completed = helpers.get_django_metadata(ctx.cls.info).setdefault("completed_initializers", [])
+    record_completion = not _is_class_deferred(semanal_api, ctx.cls)
+    stats = django_context.model_initializer_stats
     for initializer_cls in initializers:
+        name = initializer_cls.__name__
+        if name in completed:
+            stats["skipped"] += 1
+            continue
+        stats["runs"] += 1
+        deferrals = len(semanal_api.deferral_debug_context)
         try:
             initializer_cls(ctx, django_context).run()
-        except helpers.IncompleteDefnException:
-            if not ctx.api.final_iteration:
-                ctx.api.defer()
+        except helpers.IncompleteDefnException as exc:
+            django_context.deferrals.defer(
+                semanal_api, name, str(exc) or "Incomplete definition", model=ctx.cls.fullname
+            )
+            continue
+        if (
+            record_completion
+            and not initializer_cls.run_on_every_pass
+            and len(semanal_api.deferral_debug_context) == deferrals
+        ):
+            completed.append(name)
+
+
+def _is_class_deferred(api: SemanticAnalyzer, defn: ClassDef) -> bool:
+    """Whether a statement of the class requested a deferral during the current pass."""
+    end_line = defn.end_line if defn.end_line is not None else defn.line
+    return any(
+        module == api.cur_mod_id and defn.line <= line <= end_line for module, line in api.deferral_debug_context
+    )
 
 
 def set_auth_user_model_boolean_fields(ctx: AttributeContext, django_context: DjangoContext) -> MypyType:
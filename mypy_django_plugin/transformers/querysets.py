@@ -5,12 +5,6 @@ from typing import TYPE_CHECKING, Literal
 from django.core.exceptions import FieldDoesNotExist, FieldError
 from django.db.models.constants import LOOKUP_SEP
 from django.db.models.fields.related import RelatedField
-from django.db.models.fields.related_descriptors import (
-    ForwardManyToOneDescriptor,
-    ManyToManyDescriptor,
-    ReverseManyToOneDescriptor,
-    ReverseOneToOneDescriptor,
-)
 from django.db.models.fields.reverse_related import ForeignObjectRel
 from django.db.models.sql.query import Query
 from mypy.errorcodes import NO_REDEF
@@ -42,7 +36,7 @@ from mypy.types import (
 )
 from mypy.types import Type as MypyType
 
-from mypy_django_plugin.django.context import DjangoContext, LookupsAreUnsupported
+from mypy_django_plugin.django.context import DjangoContext, LookupsAreUnsupported, PrefetchTarget
 from mypy_django_plugin.lib import fullnames, helpers
 from mypy_django_plugin.lib.field_validation import (
     check_field_concrete,
@@ -152,7 +146,9 @@ def get_values_list_row_type(
                 )
                 column_types[field.attname] = column_type
             column_types.update(annotation_types)
-            return helpers.make_oneoff_named_tuple(typechecker_api, "Row", column_types)
+            return django_context.row_types.named_tuple(
+                typechecker_api, helpers.get_class_fullname(model_cls), column_types
+            )
         # flat=False, named=False, all fields
         if annotation_types:
             return typechecker_api.named_generic_type("builtins.tuple", [AnyType(TypeOfAny.special_form)])
@@ -189,7 +185,9 @@ def get_values_list_row_type(
         assert len(column_types) == 1
         row_type = next(iter(column_types.values()))
     elif named:
-        row_type = helpers.make_oneoff_named_tuple(typechecker_api, "Row", column_types)
+        row_type = django_context.row_types.named_tuple(
+            typechecker_api, helpers.get_class_fullname(model_cls), column_types
+        )
     else:
         # Since there may have been repeated field lookups, we cannot just use column_types.values here.
         # This is not the case in named above, because Django will error if duplicate fields are requested.
@@ -592,7 +590,7 @@ def extract_proper_type_queryset_values(ctx: MethodContext, django_context: Djan
 
     # Collect `**expressions` types -- `.values(lower_name=Lower("name"), foo=F("name"))`
     column_types.update(gather_expression_types(ctx))
-    row_type = helpers.make_typeddict(ctx.api, column_types)
+    row_type = django_context.row_types.typeddict(ctx.api, django_model.typ.type, column_types)
     return default_return_type.copy_modified(args=[django_model.typ, row_type])
 
 
@@ -814,75 +812,55 @@ def check_valid_prefetch_related_lookup(
     is_generic_prefetch: bool = False,
 ) -> bool:
     """Check if a lookup string resolve to something that can be prefetched"""
-    current_model_cls = django_model.cls
-    contenttypes_installed = django_context.apps_registry.is_installed("django.contrib.contenttypes")
+    validated_lookups = django_context.get_relation_catalog(django_model.cls).prefetch_related_lookups
+    validated = validated_lookups.get((lookup, is_generic_prefetch))
+    if validated is None:
+        validated = validated_lookups[lookup, is_generic_prefetch] = _validate_prefetch_related_lookup(
+            django_context, django_model.cls, lookup, is_generic_prefetch=is_generic_prefetch
+        )
+    error, is_valid = validated
+    if error is not None:
+        ctx.api.fail(error, ctx.context)
+    return is_valid
+
+
+def _validate_prefetch_related_lookup(
+    django_context: DjangoContext, model_cls: type[Model], lookup: str, *, is_generic_prefetch: bool
+) -> tuple[str | None, bool]:
+    contenttypes_installed = django_context.get_relation_catalog(model_cls).contenttypes_installed
+    # Relations of abstract models may lead to a model that isn't resolved, e.g. "self"
+    current_model_cls: type[Model] | str = model_cls
     for through_attr in lookup.split(LOOKUP_SEP):
-        rel_obj_descriptor = getattr(current_model_cls, through_attr, None)
-        if rel_obj_descriptor is None:
+        if isinstance(current_model_cls, str):
+            target = PrefetchTarget("missing")
+        else:
+            target = django_context.get_relation_catalog(current_model_cls).prefetch_target(through_attr)
+        if target.kind == "missing":
             # If current_model_cls is "self", we cannot use `__name__` and want "self".
             model_name = getattr(current_model_cls, "__name__", current_model_cls)
-            ctx.api.fail(
-                (
-                    f'Cannot find "{through_attr}" on "{model_name}" object, '
-                    f'"{lookup}" is an invalid parameter to "prefetch_related()"'
-                ),
-                ctx.context,
-            )
-            return False
+            return (
+                f'Cannot find "{through_attr}" on "{model_name}" object, '
+                f'"{lookup}" is an invalid parameter to "prefetch_related()"'
+            ), False
         if contenttypes_installed and is_generic_prefetch:
-            try:
-                from django.contrib.contenttypes.fields import GenericForeignKeyDescriptor
-            except ImportError:  # Django < 6.1
-                from django.contrib.contenttypes.fields import (  # type: ignore[assignment]
-                    GenericForeignKey as GenericForeignKeyDescriptor,
-                )
-
-            if not isinstance(rel_obj_descriptor, GenericForeignKeyDescriptor):
+            if target.kind != "generic_foreign_key":
                 # If current_model_cls is "self", we cannot use `__name__` and want "self".
                 model_name = getattr(current_model_cls, "__name__", current_model_cls)
-                ctx.api.fail(
+                return (
                     f'"{through_attr}" on "{model_name}" is not a GenericForeignKey, '
-                    f"GenericPrefetch can only be used with GenericForeignKey fields",
-                    ctx.context,
-                )
-                return True
-        elif isinstance(rel_obj_descriptor, ForwardManyToOneDescriptor):
-            current_model_cls = rel_obj_descriptor.field.remote_field.model
-        elif isinstance(rel_obj_descriptor, ReverseOneToOneDescriptor):
-            current_model_cls = rel_obj_descriptor.related.related_model
-        elif isinstance(rel_obj_descriptor, ManyToManyDescriptor):
-            current_model_cls = (
-                rel_obj_descriptor.rel.related_model if rel_obj_descriptor.reverse else rel_obj_descriptor.rel.model
-            )
-        elif isinstance(rel_obj_descriptor, ReverseManyToOneDescriptor):
-            if contenttypes_installed:
-                from django.contrib.contenttypes.fields import ReverseGenericManyToOneDescriptor
-
-                if isinstance(rel_obj_descriptor, ReverseGenericManyToOneDescriptor):
-                    current_model_cls = rel_obj_descriptor.rel.model
-                    continue
-            current_model_cls = rel_obj_descriptor.rel.related_model
+                    f"GenericPrefetch can only be used with GenericForeignKey fields"
+                ), True
+        elif target.kind == "relation":
+            current_model_cls = target.model_cls
+        elif target.kind == "generic_foreign_key":
+            # Generic foreign keys can point to any model, so we use Model as the base type
+            return None, True
         else:
-            if contenttypes_installed:
-                try:
-                    from django.contrib.contenttypes.fields import GenericForeignKeyDescriptor
-                except ImportError:  # Django < 6.1
-                    from django.contrib.contenttypes.fields import (  # type: ignore[assignment]
-                        GenericForeignKey as GenericForeignKeyDescriptor,
-                    )
-
-                if isinstance(rel_obj_descriptor, GenericForeignKeyDescriptor):
-                    # Generic foreign keys can point to any model, so we use Model as the base type
-                    return True
-            ctx.api.fail(
-                (
-                    f'"{lookup}" does not resolve to an item that supports prefetching '
-                    '- this is an invalid parameter to "prefetch_related()"'
-                ),
-                ctx.context,
-            )
-            return False
-    return True
+            return (
+                f'"{lookup}" does not resolve to an item that supports prefetching '
+                '- this is an invalid parameter to "prefetch_related()"'
+            ), False
+    return None, True
 
 
 def check_conflicting_lookups(
@@ -1028,21 +1006,6 @@ def _extract_field_names_from_varargs(ctx: MethodContext) -> list[str]:
     ]
 
 
-def _get_select_related_field_choices(model_cls: type[Model]) -> set[str]:
-    """
-    Get valid field choices for select_related lookups.
-    Based on Django's SQLCompiler.get_related_selections._get_field_choices method.
-    """
-    opts = model_cls._meta
-
-    # Direct relation fields (forward relations)
-    direct_choices = (f.name for f in opts.fields if f.is_relation)
-
-    # Reverse relation fields (backward relations with unique=True)
-    reverse_choices = (f.field.related_query_name() for f in opts.related_objects if f.field.unique)
-    return {*direct_choices, *reverse_choices}
-
-
 def _validate_select_related_lookup(
     ctx: MethodContext,
     django_context: DjangoContext,
@@ -1050,36 +1013,43 @@ def _validate_select_related_lookup(
     lookup: str,
 ) -> bool:
     """Validate a single select_related lookup string."""
+    validated_lookups = django_context.get_relation_catalog(model_cls).select_related_lookups
+    validated = validated_lookups.get(lookup)
+    if validated is None:
+        validated = validated_lookups[lookup] = _check_select_related_lookup(django_context, model_cls, lookup)
+    error, is_valid = validated
+    if error is not None:
+        ctx.api.fail(error, ctx.context)
+    return is_valid
+
+
+def _check_select_related_lookup(
+    django_context: DjangoContext, model_cls: type[Model], lookup: str
+) -> tuple[str | None, bool]:
     if not lookup.strip():
-        ctx.api.fail(
-            f'Invalid field name "{lookup}" in select_related lookup',
-            ctx.context,
-        )
-        return False
+        return f'Invalid field name "{lookup}" in select_related lookup', False
 
     lookup_parts = lookup.split(LOOKUP_SEP)
     observed_model = model_cls
     for i, part in enumerate(lookup_parts):
-        valid_choices = _get_select_related_field_choices(observed_model)
+        valid_choices = django_context.get_relation_catalog(observed_model).select_related_choices
 
         if part not in valid_choices:
-            ctx.api.fail(
+            return (
                 f'Invalid field name "{part}" in select_related lookup. '
-                f"Choices are: {', '.join(sorted(valid_choices)) or '(none)'}",
-                ctx.context,
-            )
-            return False
+                f"Choices are: {', '.join(sorted(valid_choices)) or '(none)'}"
+            ), False
 
         if i < len(lookup_parts) - 1:  # Not the last part
             try:
                 field, observed_model = django_context.resolve_lookup_into_field(observed_model, part)
                 if field is None:
-                    return False
+                    return None, False
             except (FieldError, LookupsAreUnsupported):
                 # For good measure, but we should never reach this since we already validated the part name
-                return False
+                return None, False
 
-    return True
+    return None, True
 
 
 def validate_select_related(ctx: MethodContext, django_context: DjangoContext) -> MypyType:
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from mypy.nodes import MemberExpr
-from mypy.types import AnyType, TypeOfAny
+from mypy.types import AnyType, NoneType, TypeOfAny
 from mypy.types import Type as MypyType
 
+from mypy_django_plugin.django.schema import ANY_TYPE, NONE_TYPE
 from mypy_django_plugin.lib import helpers
 
 if TYPE_CHECKING:
+    from mypy.checker import TypeChecker
     from mypy.plugin import AttributeContext
 
     from mypy_django_plugin.config import DjangoPluginConfig
@@ -22,11 +24,20 @@ def get_type_of_settings_attribute(
         return ctx.default_attr_type
 
     setting_name = ctx.context.name
+    setting_type = django_context.setting_type_cache.get(setting_name)
+    if setting_type is not None:
+        return setting_type
 
     typechecker_api = helpers.get_typechecker_api(ctx)
 
-    # first look for the setting in the project settings file, then global settings
-    settings_module = typechecker_api.modules.get(django_context.django_settings_module)
+    # Types of the project settings come from a single source: their runtime values, a stub or the settings module
+    runtime_types = plugin_config.settings_type_snapshot and plugin_config.settings_types_module is None
+    # first look for the setting in the project settings file (or its stub), then global settings
+    settings_module = None
+    if not runtime_types:
+        settings_module = typechecker_api.modules.get(
+            plugin_config.settings_types_module or django_context.django_settings_module
+        )
     global_settings_module = typechecker_api.modules.get("django.conf.global_settings")
     for module in [settings_module, global_settings_module]:
         if module is not None:
@@ -36,8 +47,17 @@ def get_type_of_settings_attribute(
                     # When analysing a function, mypy will defer analysis to a later pass
                     typechecker_api.handle_cannot_determine_type(setting_name, ctx.context)
                     return ctx.default_attr_type
+                django_context.setting_type_cache.set(setting_name, sym.type)
                 return sym.type
 
+    # Even when the settings module is part of the build, e.g. `mypy user.py mysettings.py`
+    if runtime_types:
+        description = django_context.setting_types.get(setting_name)
+        if description is not None:
+            setting_type = _type_from_description(typechecker_api, description)
+            django_context.setting_type_cache.set(setting_name, setting_type)
+            return setting_type
+
     # Now, we want to check if this setting really exist in runtime.
     # If it does, we just return `Any`, not to raise any false-positives.
     # But, we cannot reconstruct the exact runtime type.
@@ -47,3 +67,13 @@ def get_type_of_settings_attribute(
 
     ctx.api.fail(f"'Settings' object has no attribute {setting_name!r}", ctx.context)
     return ctx.default_attr_type
+
+
+def _type_from_description(api: TypeChecker, description: list[Any]) -> MypyType:
+    """The type described by `schema.describe_value_type()`."""
+    fullname, *args = description
+    if fullname == ANY_TYPE:
+        return AnyType(TypeOfAny.special_form)
+    if fullname == NONE_TYPE:
+        return NoneType()
+    return api.named_generic_type(fullname, [_type_from_description(api, arg) for arg in args])
@@ -0,0 +1,232 @@
+"""Benchmark the mypy plugin on a generated Django project.
+
+Usage: `python -m scripts.benchmark [--apps 20 --models-per-app 15 ...] [--output baseline.json] [--compare old.json]`
+
+Each scenario is measured on a freshly generated project:
+
+- `cold`: no mypy cache
+- `warm`: nothing changed since the previous run
+- `incremental_models`: a field was added to one model
+- `incremental_usage`: one module using the models was edited
+
+Wall time, peak RSS of the mypy process, the size of `.mypy_cache` and counters of the plugin's work
+(from its JSON report) are written as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import importlib.metadata
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from scripts.benchmark.project import ProjectSpec, generate_project
+
+SCENARIOS = ("cold", "warm", "incremental_models", "incremental_usage")
+# Reported by `--compare` when a metric grew by more than this
+REGRESSION_THRESHOLD = 0.1
+METRICS = ("wall_time", "peak_rss", "cache_size", "deferrals", "initializer_runs")
+
+
+@dataclasses.dataclass(frozen=True)
+class Measurement:
+    wall_time: float
+    peak_rss: int
+    cache_size: int
+    exit_status: int
+    # Semantic analysis deferrals requested by the plugin
+    deferrals: int
+    # Model initializers run, and skipped as done on a previous pass
+    initializer_runs: int
+    initializers_skipped: int
+
+
+def _run_mypy(project: Path) -> Measurement:
+    started = time.perf_counter()
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "mypy", "--config-file", "mypy.ini", "settings.py", *sorted(_apps(project))],
+            # `python -m` puts the project on `sys.path`, for the plugin to import its settings
+            cwd=project,
+            env={**os.environ, "DJANGO_STUBS_REPORT": "json"},
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+        )
+        assert process.stdout is not None
+        output = process.stdout.read()
+        # Unlike `resource.getrusage()`, this gives the peak RSS of this process only
+        _, status, rusage = os.wait4(process.pid, 0)
+        wall_time = time.perf_counter() - started
+        stderr.seek(0)
+        errors = stderr.read().decode()
+    exit_status = os.waitstatus_to_exitcode(status)
+    if exit_status not in {0, 1}:
+        sys.exit(f"mypy crashed on {project}:\n{output.decode()}{errors}")
+    # Kilobytes on Linux, bytes on macOS
+    peak_rss = rusage.ru_maxrss if sys.platform == "darwin" else rusage.ru_maxrss * 1024
+    report = _plugin_report(errors)
+    return Measurement(
+        wall_time,
+        peak_rss,
+        _directory_size(project / ".mypy_cache"),
+        exit_status,
+        deferrals=report.get("deferrals", {}).get("total", 0),
+        initializer_runs=report.get("model_initializers", {}).get("runs", 0),
+        initializers_skipped=report.get("model_initializers", {}).get("skipped", 0),
+    )
+
+
+def _plugin_report(stderr: str) -> dict[str, Any]:
+    """The JSON report printed by the plugin at exit, the last top-level object on stderr."""
+    lines = stderr.splitlines()
+    starts = [index for index, line in enumerate(lines) if line == "{"]
+    if not starts:
+        return {}
+    report: dict[str, Any] = json.loads("\n".join(lines[starts[-1] :]))
+    return report
+
+
+def _apps(project: Path) -> list[str]:
+    return [path.parent.name for path in project.glob("*/models.py")]
+
+
+def _directory_size(path: Path) -> int:
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+
+
+def _edit_models(project: Path) -> None:
+    models = project / "app0" / "models.py"
+    # Adds a field to the last model of the module
+    models.write_text(models.read_text() + "    benchmark_edit = models.IntegerField(default=0)\n")
+
+
+def _edit_usage(project: Path) -> None:
+    usage = project / "app0" / "usage.py"
+    usage.write_text(usage.read_text() + "\n\ndef benchmark_edit() -> int:\n    return 1\n")
+
+
+def run_scenario(spec: ProjectSpec, scenario: str, workdir: Path) -> Measurement:
+    project = workdir / scenario
+    shutil.rmtree(project, ignore_errors=True)
+    generate_project(spec, project)
+    if scenario == "cold":
+        return _run_mypy(project)
+    # Fill the cache first
+    _run_mypy(project)
+    if scenario == "incremental_models":
+        _edit_models(project)
+    elif scenario == "incremental_usage":
+        _edit_usage(project)
+    return _run_mypy(project)
+
+
+def run_benchmark(spec: ProjectSpec, scenarios: list[str], repeat: int, workdir: Path) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for scenario in scenarios:
+        samples = [run_scenario(spec, scenario, workdir) for _ in range(repeat)]
+        results[scenario] = {
+            "wall_time": statistics.median(sample.wall_time for sample in samples),
+            "peak_rss": max(sample.peak_rss for sample in samples),
+            "cache_size": samples[-1].cache_size,
+            "exit_status": samples[-1].exit_status,
+            "deferrals": samples[-1].deferrals,
+            "initializer_runs": samples[-1].initializer_runs,
+            "initializers_skipped": samples[-1].initializers_skipped,
+            "samples": [dataclasses.asdict(sample) for sample in samples],
+        }
+        print(
+            f"{scenario:<20} {results[scenario]['wall_time']:8.2f}s"
+            f" {results[scenario]['peak_rss'] / 2**20:8.1f} MiB RSS"
+            f" {results[scenario]['cache_size'] / 2**20:8.1f} MiB cache"
+            f" {results[scenario]['deferrals']:6} deferrals"
+            f" {results[scenario]['initializer_runs']:6} initializer runs"
+            f" ({results[scenario]['initializers_skipped']} skipped)",
+            file=sys.stderr,
+        )
+    return {
+        "spec": dataclasses.asdict(spec),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **{package: _version(package) for package in ("mypy", "django", "django-stubs")},
+        },
+        "results": results,
+    }
+
+
+def _version(package: str) -> str | None:
+    try:
+        return importlib.metadata.version(package)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    """Metrics that grew by more than `REGRESSION_THRESHOLD` since the baseline."""
+    regressions = []
+    for scenario, result in current["results"].items():
+        previous = baseline["results"].get(scenario)
+        if previous is None:
+            continue
+        for metric in METRICS:
+            # Missing from results of older versions of this script
+            if metric not in previous or metric not in result:
+                continue
+            if previous[metric] and result[metric] > previous[metric] * (1 + REGRESSION_THRESHOLD):
+                change = result[metric] / previous[metric] - 1
+                regressions.append(
+                    f"{scenario} {metric}: {previous[metric]:.6g} -> {result[metric]:.6g} (+{change:.0%})"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m scripts.benchmark", description=__doc__.splitlines()[0])
+    defaults = ProjectSpec()
+    for field in dataclasses.fields(ProjectSpec):
+        default = getattr(defaults, field.name)
+        option = "--" + field.name.replace("_", "-")
+        if isinstance(default, bool):
+            parser.add_argument(option, action=argparse.BooleanOptionalAction, default=default)
+        else:
+            parser.add_argument(option, type=type(default), default=default, help=f"default: {default}")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="default: all of them")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per scenario, the median wall time is kept")
+    parser.add_argument("--workdir", type=Path, help="where to generate projects, default: a temporary directory")
+    parser.add_argument("--output", type=Path, help="write the results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="a previous `--output`, exit with 1 on regressions")
+    args = parser.parse_args()
+
+    spec = ProjectSpec(**{field.name: getattr(args, field.name) for field in dataclasses.fields(ProjectSpec)})
+    scenarios = args.scenario or list(SCENARIOS)
+    if args.workdir is not None:
+        results = run_benchmark(spec, scenarios, args.repeat, args.workdir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="django-stubs-benchmark-") as workdir:
+            results = run_benchmark(spec, scenarios, args.repeat, Path(workdir))
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare is not None:
+        regressions = compare(json.loads(args.compare.read_text()), results)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Generate a synthetic Django project exercising the mypy plugin, sized by a `ProjectSpec`."""
+
+from __future__ import annotations
+
+import dataclasses
+import random
+import textwrap
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Statements checked for every model in the `usage.py` module of its app, cycled through
+# `call_sites_per_model` times. `{model}` is the model class, `{fk}` one of its foreign keys if any.
+CALL_SITES = (
+    "{model}.objects.filter(name__icontains='a', rank__gte=1).exclude(pk=1).first()",
+    "{model}.objects.annotate(double_rank=F('rank') * 2).values('name', 'double_rank')",
+    "{model}.objects.values_list('pk', 'name', named=True).get(pk=1)",
+    "{model}.objects.order_by('-rank').only('name').exists()",
+    "{model}.objects.create(name='x', rank=1)",
+    "{model}.objects.get(name='x').save(update_fields=['name'])",
+)
+FK_CALL_SITES = (
+    "{model}.objects.select_related('{fk}').filter({fk}__name__startswith='a').count()",
+    "{model}.objects.values('{fk}__name').annotate(total=Count('pk'))",
+)
+CUSTOM_MANAGER_CALL_SITES = ("{model}.objects.ranked().filter(name='x').first()",)
+
+
+@dataclasses.dataclass(frozen=True)
+class ProjectSpec:
+    apps: int = 10
+    models_per_app: int = 10
+    # Foreign keys and many-to-many fields per model, pointing at random models of any app
+    fks_per_model: int = 2
+    m2ms_per_model: int = 1
+    # Abstract models each concrete model inherits from, in a single chain per app
+    abstract_depth: int = 2
+    # Share of the models with a custom queryset, made a manager by `Manager.from_queryset()`
+    # (or by `QuerySet.as_manager()` when `from_queryset` is false)
+    custom_manager_ratio: float = 0.5
+    from_queryset: bool = True
+    # Define the custom querysets and managers in a `managers.py` module importing the models. The import cycle
+    # leaves the managers unresolved on the first semantic analysis passes of the models.
+    managers_module: bool = False
+    call_sites_per_model: int = 4
+    seed: int = 0
+
+    @property
+    def app_labels(self) -> list[str]:
+        return [f"app{index}" for index in range(self.apps)]
+
+
+@dataclasses.dataclass(frozen=True)
+class _Model:
+    app: str
+    name: str
+    custom_manager: bool
+    # (field name, lazy reference of the related model)
+    fks: list[tuple[str, str]]
+    m2ms: list[tuple[str, str]]
+
+
+def _plan_models(spec: ProjectSpec) -> dict[str, list[_Model]]:
+    rng = random.Random(spec.seed)
+    references = [f"{app}.Model{index}" for app in spec.app_labels for index in range(spec.models_per_app)]
+    plan: dict[str, list[_Model]] = {}
+    for app in spec.app_labels:
+        plan[app] = [
+            _Model(
+                app=app,
+                name=f"Model{index}",
+                custom_manager=rng.random() < spec.custom_manager_ratio,
+                fks=[(f"fk{number}", rng.choice(references)) for number in range(spec.fks_per_model)],
+                m2ms=[(f"m2m{number}", rng.choice(references)) for number in range(spec.m2ms_per_model)],
+            )
+            for index in range(spec.models_per_app)
+        ]
+    return plan
+
+
+def _render_managers(spec: ProjectSpec, models: list[_Model]) -> list[str]:
+    lines = []
+    for model in models:
+        if not model.custom_manager:
+            continue
+        lines += [
+            "",
+            "",
+            f"class {model.name}QuerySet(models.QuerySet[{model.name!r}]):",
+            "    def ranked(self) -> Self:",
+            "        return self.filter(rank__gt=0).order_by('-rank')",
+        ]
+        if spec.from_queryset:
+            lines += ["", "", f"{model.name}Manager = models.Manager.from_queryset({model.name}QuerySet)"]
+    return lines
+
+
+def _render_managers_module(spec: ProjectSpec, app: str, models: list[_Model]) -> str:
+    names = ", ".join(model.name for model in models if model.custom_manager)
+    lines = [
+        "from __future__ import annotations",
+        "",
+        "from typing import TYPE_CHECKING",
+        "",
+        "from django.db import models",
+        "from typing_extensions import Self",
+    ]
+    if names:
+        lines += ["", "if TYPE_CHECKING:", f"    from {app}.models import {names}"]
+    return "\n".join(lines + _render_managers(spec, models)) + "\n"
+
+
+def _render_models(spec: ProjectSpec, app: str, models: list[_Model]) -> str:
+    lines = [
+        "from __future__ import annotations",
+        "",
+        "from django.db import models",
+    ]
+    if spec.managers_module:
+        suffix = "Manager" if spec.from_queryset else "QuerySet"
+        names = ", ".join(f"{model.name}{suffix}" for model in models if model.custom_manager)
+        if names:
+            lines += ["", f"from {app}.managers import {names}"]
+    else:
+        lines.insert(3, "from typing_extensions import Self")
+    base = "models.Model"
+    for depth in range(spec.abstract_depth):
+        lines += [
+            "",
+            "",
+            f"class Abstract{depth}({base}):",
+            f"    abstract_field{depth} = models.IntegerField(default={depth})",
+            "",
+            "    class Meta:",
+            "        abstract = True",
+        ]
+        base = f"Abstract{depth}"
+
+    for model in models:
+        if not spec.managers_module:
+            lines += _render_managers(spec, [model])
+        lines += [
+            "",
+            "",
+            f"class {model.name}({base}):",
+            "    name = models.CharField(max_length=100)",
+            "    rank = models.IntegerField(default=0)",
+        ]
+        for field, target in model.fks:
+            related_name = f"{app}_{model.name.lower()}_{field}"
+            lines.append(
+                f"    {field} = models.ForeignKey({target!r}, on_delete=models.CASCADE, related_name={related_name!r})"
+            )
+        for field, target in model.m2ms:
+            related_name = f"{app}_{model.name.lower()}_{field}"
+            lines.append(f"    {field} = models.ManyToManyField({target!r}, related_name={related_name!r})")
+        if model.custom_manager:
+            manager = f"{model.name}Manager()" if spec.from_queryset else f"{model.name}QuerySet.as_manager()"
+            lines.append(f"    objects = {manager}")
+    return "\n".join(lines) + "\n"
+
+
+def _render_usage(spec: ProjectSpec, app: str, models: list[_Model]) -> str:
+    names = ", ".join(model.name for model in models)
+    lines = [
+        "from __future__ import annotations",
+        "",
+        "from django.db.models import Count, F",
+        "",
+        f"from {app}.models import {names}",
+    ]
+    for model in models:
+        templates = list(CALL_SITES)
+        if model.fks:
+            templates += FK_CALL_SITES
+        if model.custom_manager:
+            templates += CUSTOM_MANAGER_CALL_SITES
+        fk = model.fks[0][0] if model.fks else ""
+        lines += ["", "", f"def use_{model.name.lower()}() -> None:"]
+        for index in range(spec.call_sites_per_model):
+            template = templates[index % len(templates)]
+            lines.append("    " + template.format(model=model.name, fk=fk))
+        if not spec.call_sites_per_model:
+            lines.append("    pass")
+    return "\n".join(lines) + "\n"
+
+
+def generate_project(spec: ProjectSpec, root: Path) -> None:
+    """Write the project to `root`: a `settings` module, a mypy config and one package per app."""
+    plan = _plan_models(spec)
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "settings.py").write_text(
+        textwrap.dedent(
+            f"""\
+            SECRET_KEY = "benchmark"
+            INSTALLED_APPS = {["django.contrib.contenttypes", "django.contrib.auth", *spec.app_labels]!r}
+            DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+            """
+        )
+    )
+    (root / "mypy.ini").write_text(
+        textwrap.dedent(
+            """\
+            [mypy]
+            plugins = mypy_django_plugin.main
+            strict = true
+
+            [mypy.plugins.django-stubs]
+            django_settings_module = settings
+            """
+        )
+    )
+    for app, models in plan.items():
+        package = root / app
+        package.mkdir(exist_ok=True)
+        (package / "__init__.py").write_text("")
+        (package / "models.py").write_text(_render_models(spec, app, models))
+        (package / "usage.py").write_text(_render_usage(spec, app, models))
+        if spec.managers_module:
+            (package / "managers.py").write_text(_render_managers_module(spec, app, models))
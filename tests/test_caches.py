@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from mypy.nodes import Block, CallExpr, ClassDef, NameExpr, SymbolTable, TypeInfo, Var
+from mypy.types import AnyType, PartialType, TypeOfAny
+
+from mypy_django_plugin.lib.caches import ClassCallCache, DynamicManagerMethodCache, SettingTypeCache
+
+
+def make_info(name: str = "Base") -> TypeInfo:
+    defn = ClassDef(name, Block([]))
+    defn.fullname = f"myapp.models.{name}"
+    info = TypeInfo(SymbolTable(), defn, "myapp.models")
+    defn.info = info
+    return info
+
+
+def make_call() -> CallExpr:
+    return CallExpr(NameExpr("ManyToManyField"), [], [], [])
+
+
+def test_class_call_values_reused_for_same_class_and_call() -> None:
+    cache: ClassCallCache[str] = ClassCallCache()
+    info, call = make_info(), make_call()
+    cache.set(info, call, "resolved")
+
+    assert cache.get(info, call) == "resolved"
+    assert cache.get(info, make_call()) is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_class_call_values_dropped_for_new_type_info() -> None:
+    cache: ClassCallCache[str] = ClassCallCache()
+    call = make_call()
+    cache.set(make_info(), call, "resolved")
+
+    # The module was processed again
+    assert cache.get(make_info(), call) is None
+    assert len(cache) == 0
+
+
+def test_setting_types_skip_partial_types() -> None:
+    cache = SettingTypeCache()
+    setting_type = AnyType(TypeOfAny.explicit)
+    cache.set("DEBUG", setting_type)
+    cache.set("ROOT_URLCONF", PartialType(None, Var("ROOT_URLCONF")))
+
+    assert cache.get("DEBUG") is setting_type
+    assert cache.get("ROOT_URLCONF") is None
+    cache.clear()
+    assert cache.get("DEBUG") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "entries": 0}
+
+
+def test_manager_methods_dropped_for_new_queryset_type_info() -> None:
+    cache = DynamicManagerMethodCache()
+    manager, model, queryset = make_info("BookManager"), make_info("Book"), make_info("BookQuerySet")
+    method_type = AnyType(TypeOfAny.explicit)
+    cache.set(manager, model, queryset, "published", method_type)
+
+    assert cache.get(manager, model, queryset, "published") is method_type
+    # The module of the queryset was processed again
+    assert cache.get(manager, model, make_info("BookQuerySet"), "published") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from mypy.nodes import AssignmentStmt, Block, CallExpr, ClassDef, MemberExpr, NameExpr, PassStmt
+
+from mypy_django_plugin.lib.class_body import ClassBodyIndexCache
+
+
+def assign(lvalue: NameExpr | MemberExpr, callee: str) -> AssignmentStmt:
+    return AssignmentStmt([lvalue], CallExpr(NameExpr(callee), [], [], []))
+
+
+def make_class(*body: AssignmentStmt | PassStmt) -> ClassDef:
+    defn = ClassDef("Book", Block(list(body)))
+    defn.fullname = "myapp.models.Book"
+    return defn
+
+
+def test_finds_assignments_by_rvalue_and_name() -> None:
+    title = assign(NameExpr("title"), "CharField")
+    objects = assign(NameExpr("objects"), "BookManager")
+    redefined = assign(NameExpr("objects"), "OtherManager")
+    attribute = assign(MemberExpr(NameExpr("self"), "author"), "ForeignKey")
+    index = ClassBodyIndexCache().get(make_class(title, PassStmt(), objects, redefined, attribute))
+
+    assert index.assignment_of(title.rvalue) is title
+    assert index.assignment_of(attribute.rvalue) is attribute
+    assert index.assignment_of(CallExpr(NameExpr("CharField"), [], [], [])) is None
+    assert index.assignment_to("objects") is objects
+    assert index.assignment_to("author") is None
+
+
+def test_rebuilt_when_class_body_changes() -> None:
+    cache = ClassBodyIndexCache()
+    title = assign(NameExpr("title"), "CharField")
+    defn = make_class(title)
+
+    assert cache.get(defn) is cache.get(defn)
+
+    # A plugin added a statement
+    added = assign(NameExpr("isbn"), "CharField")
+    defn.defs.body.append(added)
+    assert cache.get(defn).assignment_to("isbn") is added
+
+    # The class body was replaced, e.g. when a module is processed again
+    defn.defs.body = [title]
+    assert cache.get(defn).assignment_to("isbn") is None
+    assert cache.stats() == {"hits": 1, "misses": 3, "entries": 1}
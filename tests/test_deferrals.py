@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+from mypy_django_plugin.lib.deferrals import WORST_OFFENDERS, DeferralLog
+
+if TYPE_CHECKING:
+    from mypy.semanal import SemanticAnalyzer
+
+
+class FakeSemanticAnalyzer:
+    def __init__(self, module: str, *, final_iteration: bool = False) -> None:
+        self.cur_mod_id = module
+        self.final_iteration = final_iteration
+        self.deferred = 0
+
+    def defer(self) -> None:
+        self.deferred += 1
+
+
+def test_counts_deferrals() -> None:
+    log = DeferralLog()
+    api = FakeSemanticAnalyzer("myapp.models")
+    semanal_api = cast("SemanticAnalyzer", api)
+    log.defer(semanal_api, "AddManagers", "Unresolved manager types: objects", model="myapp.models.Book")
+    log.defer(semanal_api, "AddManagers", "Unresolved manager types: objects", model="myapp.models.Book")
+    log.defer(semanal_api, "resolve_lazy_reference", "Lazy reference 'otherapp.Author' not analyzed yet")
+
+    report = log.report()
+    assert api.deferred == 3
+    assert report["total"] == 3
+    assert report["by_initializer"] == {"AddManagers": 2, "resolve_lazy_reference": 1}
+    assert report["worst_modules"] == [{"module": "myapp.models", "deferrals": 3}]
+    assert report["worst_models"] == [{"model": "myapp.models.Book", "deferrals": 2}]
+    assert report["worst_reasons"][0] == {
+        "initializer": "AddManagers",
+        "reason": "Unresolved manager types: objects",
+        "deferrals": 2,
+    }
+
+
+def test_final_iteration_is_not_deferred() -> None:
+    log = DeferralLog()
+    api = FakeSemanticAnalyzer("myapp.models", final_iteration=True)
+    log.defer(cast("SemanticAnalyzer", api), "AddManagers", "Unresolved manager types: objects")
+
+    assert api.deferred == 0
+    assert log.report() == {}
+
+
+def test_reports_worst_offenders_only() -> None:
+    log = DeferralLog()
+    for index in range(WORST_OFFENDERS + 2):
+        api = cast("SemanticAnalyzer", FakeSemanticAnalyzer(f"app{index}.models"))
+        for _ in range(index + 1):
+            log.record(api, "AddReverseLookups", "No '_default_manager' yet", model=f"app{index}.models.Book")
+
+    report = log.report()
+    assert len(report["worst_modules"]) == len(report["worst_models"]) == WORST_OFFENDERS
+    assert report["worst_modules"][0] == {
+        "module": f"app{WORST_OFFENDERS + 1}.models",
+        "deferrals": WORST_OFFENDERS + 2,
+    }
@@ -20,7 +20,13 @@ TEMPLATE = """
 [mypy.plugins.django-stubs]
 django_settings_module = str (default: `os.getenv("DJANGO_SETTINGS_MODULE")`)
 strict_settings = bool (default: true)
+settings_type_snapshot = bool (default: false)
+settings_types_module = str (default: none)
 strict_model_abstract_attrs = bool (default: true)
+schema_snapshot = bool (default: false)
+report = bool (default: false)
+profile = bool (default: false)
+lookup_cache_size = int (default: 4096)
 ...
 (django-stubs) mypy: error: {}
 """
@@ -31,7 +37,13 @@ TEMPLATE_TOML = """
 [tool.django-stubs]
 django_settings_module = str (default: `os.getenv("DJANGO_SETTINGS_MODULE")`)
 strict_settings = bool (default: true)
+settings_type_snapshot = bool (default: false)
+settings_types_module = str (default: none)
 strict_model_abstract_attrs = bool (default: true)
+schema_snapshot = bool (default: false)
+report = bool (default: false)
+profile = bool (default: false)
+lookup_cache_size = int (default: 4096)
 ...
 (django-stubs) mypy: error: {}
 """
@@ -74,6 +86,11 @@ def write_to_file(file_contents: str, suffix: str | None = None) -> Generator[st
             "invalid 'strict_settings': the setting must be a boolean",
             id="invalid-strict_settings",
         ),
+        pytest.param(
+            ["[mypy.plugins.django-stubs]", "django_settings_module = some.module", "settings_type_snapshot = bad"],
+            "invalid 'settings_type_snapshot': the setting must be a boolean",
+            id="invalid-settings_type_snapshot",
+        ),
         pytest.param(
             [
                 "[mypy.plugins.django-stubs]",
@@ -83,6 +100,31 @@ def write_to_file(file_contents: str, suffix: str | None = None) -> Generator[st
             "invalid 'strict_model_abstract_attrs': the setting must be a boolean",
             id="invalid-strict_model_abstract_attrs",
         ),
+        pytest.param(
+            ["[mypy.plugins.django-stubs]", "django_settings_module = some.module", "schema_snapshot = bad"],
+            "invalid 'schema_snapshot': the setting must be a boolean",
+            id="invalid-schema_snapshot",
+        ),
+        pytest.param(
+            ["[mypy.plugins.django-stubs]", "django_settings_module = some.module", "report = bad"],
+            "invalid 'report': the setting must be a boolean",
+            id="invalid-report",
+        ),
+        pytest.param(
+            ["[mypy.plugins.django-stubs]", "django_settings_module = some.module", "profile = bad"],
+            "invalid 'profile': the setting must be a boolean",
+            id="invalid-profile",
+        ),
+        pytest.param(
+            ["[mypy.plugins.django-stubs]", "django_settings_module = some.module", "lookup_cache_size = many"],
+            "invalid 'lookup_cache_size': the setting must be a non-negative integer",
+            id="invalid-lookup_cache_size",
+        ),
+        pytest.param(
+            ["[mypy.plugins.django-stubs]", "django_settings_module = some.module", "lookup_cache_size = -1"],
+            "invalid 'lookup_cache_size': the setting must be a non-negative integer",
+            id="negative-lookup_cache_size",
+        ),
     ],
 )
 def test_misconfiguration_handling(capsys: Any, config_file_contents: list[str], message_part: str) -> None:
@@ -156,6 +198,24 @@ def test_handles_filename(capsys: Any, filename: str) -> None:
             "invalid 'strict_settings': the setting must be a boolean",
             id="invalid strict_settings type",
         ),
+        pytest.param(
+            """
+            [tool.django-stubs]
+            django_settings_module = "some.module"
+            settings_type_snapshot = "a"
+            """,
+            "invalid 'settings_type_snapshot': the setting must be a boolean",
+            id="invalid settings_type_snapshot type",
+        ),
+        pytest.param(
+            """
+            [tool.django-stubs]
+            django_settings_module = "some.module"
+            settings_types_module = 1
+            """,
+            "invalid 'settings_types_module': the setting must be a string",
+            id="invalid settings_types_module type",
+        ),
         pytest.param(
             """
             [tool.django-stubs]
@@ -165,6 +225,33 @@ def test_handles_filename(capsys: Any, filename: str) -> None:
             "invalid 'strict_model_abstract_attrs': the setting must be a boolean",
             id="invalid strict_model_abstract_attrs type",
         ),
+        pytest.param(
+            """
+            [tool.django-stubs]
+            django_settings_module = "some.module"
+            schema_snapshot = "a"
+            """,
+            "invalid 'schema_snapshot': the setting must be a boolean",
+            id="invalid schema_snapshot type",
+        ),
+        pytest.param(
+            """
+            [tool.django-stubs]
+            django_settings_module = "some.module"
+            profile = "a"
+            """,
+            "invalid 'profile': the setting must be a boolean",
+            id="invalid profile type",
+        ),
+        pytest.param(
+            """
+            [tool.django-stubs]
+            django_settings_module = "some.module"
+            lookup_cache_size = "a"
+            """,
+            "invalid 'lookup_cache_size': the setting must be a non-negative integer",
+            id="invalid lookup_cache_size type",
+        ),
     ],
 )
 def test_toml_misconfiguration_handling(capsys: Any, config_file_contents: str, message_part: str) -> None:
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+from mypy.errors import Errors
+from mypy.options import Options
+from mypy.parse import parse
+
+from mypy_django_plugin.transformers.apps import find_get_model_references
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        pytest.param("from django.apps import AppConfig\n", set(), id="no-calls"),
+        pytest.param('apps.get_model("myapp.Book")\n', {"myapp.Book"}, id="label"),
+        pytest.param("apps.get_model('myapp', 'Book')\n", {"myapp.Book"}, id="app-label-and-model-name"),
+        pytest.param(
+            'apps.get_model(\n    "myapp",\n    "Book",\n)\nregistry.get_model("other.Author")\n',
+            {"myapp.Book", "other.Author"},
+            id="multiple",
+        ),
+        pytest.param(
+            'def load():\n    """Uses get_model(name)."""\n    # get_model(name)\n    return get_model("myapp.Book")\n',
+            {"myapp.Book"},
+            id="comments-and-docstrings",
+        ),
+        pytest.param('apps.get_model(app_label, "Book")\n', None, id="dynamic-app-label"),
+        pytest.param('apps.get_model(f"myapp.{name}")\n', None, id="f-string"),
+        pytest.param('apps.get_model(app_label="myapp", model_name="Book")\n', None, id="keywords"),
+        pytest.param("get_model = apps.get_model\n", None, id="not-called"),
+        pytest.param("from django.apps.registry import get_model as load_model\n", None, id="aliased"),
+    ],
+)
+def test_find_get_model_references(source: str, expected: set[str] | None) -> None:
+    options = Options()
+    file = parse(source, "services.py", "services", Errors(options), options)
+
+    assert find_get_model_references(file) == expected
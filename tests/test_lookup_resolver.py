@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import django
+import pytest
+from django.db.models.constants import LOOKUP_SEP
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from django.db.models import Model
+
+
+def _setup_django() -> None:
+    with mock.patch.dict(os.environ, {"DJANGO_SETTINGS_MODULE": "scripts.django_tests_settings"}):
+        django.setup()
+
+
+def _abstract_model_with_lazy_relations() -> type[Model]:
+    from django.db import models
+
+    class AbstractBook(models.Model):
+        title = models.CharField(max_length=100)
+        author = models.ForeignKey("auth.User", on_delete=models.CASCADE)
+        parent = models.ForeignKey("self", on_delete=models.CASCADE)
+        readers = models.ManyToManyField("auth.User", related_name="+")
+
+        class Meta:
+            abstract = True
+            app_label = "auth"
+
+    return AbstractBook
+
+
+def _all_models() -> list[type[Model]]:
+    from django.apps import apps
+
+    models: dict[str, type[Model]] = {}
+    for model_cls in apps.get_models(include_auto_created=True, include_swapped=True):
+        for base in model_cls.mro():
+            if hasattr(base, "_meta"):
+                models[base._meta.label] = base
+    return [*(models[label] for label in sorted(models)), _abstract_model_with_lazy_relations()]
+
+
+def _lookups(model_cls: type[Model]) -> Iterator[str]:
+    yield from ("pk", "pk__in", "pk__exact__isnull", "", "__", "does_not_exist", "does_not_exist__exact")
+    for field in model_cls._meta.get_fields(include_hidden=True):
+        names = {field.name, getattr(field, "attname", None) or field.name}
+        for name in sorted(names):
+            yield name
+            yield f"{name}__exact"
+            yield f"{name}__isnull"
+            yield f"{name}__year__gte"
+            yield f"{name}__does_not_exist"
+            related_model = field.related_model
+            if not isinstance(related_model, type):
+                continue
+            yield f"{name}__pk"
+            yield f"{name}__pk__in"
+            for related_field in related_model._meta.get_fields()[:4]:
+                yield LOOKUP_SEP.join((name, related_field.name))
+                yield LOOKUP_SEP.join((name, related_field.name, "icontains"))
+                if isinstance(related_field.related_model, type):
+                    yield LOOKUP_SEP.join((name, related_field.name, "pk", "lt"))
+
+
+def _outcome(func: Any, model_cls: type[Model], lookup: str) -> Any:
+    try:
+        lookup_parts, field_parts, expression = func(model_cls, lookup)
+    except Exception as exc:
+        return type(exc), str(exc)
+    return list(lookup_parts), list(field_parts), expression
+
+
+def test_lookup_resolution_matches_django() -> None:
+    """The resolver gives the same results and errors as Django's own `Query.solve_lookup_type()`."""
+    _setup_django()
+    from django.db.models.sql.query import Query
+
+    from mypy_django_plugin.django.context import solve_model_lookup_type
+
+    def solve_with_query(model_cls: type[Model], lookup: str) -> Any:
+        return Query(model_cls).solve_lookup_type(lookup)
+
+    checked = 0
+    for model_cls in _all_models():
+        for lookup in _lookups(model_cls):
+            expected = _outcome(solve_with_query, model_cls, lookup)
+            assert _outcome(solve_model_lookup_type, model_cls, lookup) == expected, (model_cls, lookup)
+            checked += 1
+    assert checked > 1000
+
+
+@pytest.mark.parametrize(
+    ("lookup", "expected"),
+    [
+        pytest.param("pk", ([], ["pk"], False), id="pk"),
+        pytest.param("username__icontains", (["icontains"], ["username"], False), id="transform"),
+        pytest.param("groups__name__in", (["in"], ["groups", "name"], False), id="m2m"),
+        pytest.param("logentry__user__pk", ([], ["logentry", "user", "pk"], False), id="reverse"),
+        pytest.param("date_joined__year__gt", (["year", "gt"], ["date_joined"], False), id="transforms"),
+    ],
+)
+def test_lookup_resolution(lookup: str, expected: tuple[list[str], list[str], bool]) -> None:
+    _setup_django()
+    from django.contrib.auth.models import User
+
+    from mypy_django_plugin.django.context import solve_model_lookup_type
+
+    assert _outcome(solve_model_lookup_type, User, lookup) == expected
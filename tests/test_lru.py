@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from mypy_django_plugin.lib.lru import LRUCache
+
+
+def test_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == {"maxsize": 2, "entries": 2, "hits": 3, "misses": 1, "evictions": 1}
+
+
+def test_zero_size_disables_cache() -> None:
+    cache: LRUCache[str, int] = LRUCache(0)
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
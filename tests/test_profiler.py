@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from mypy_django_plugin.lib.profiler import PROFILE_ENV_VAR, SLOWEST_CALLS, HookProfiler, profile_format_from_env
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def test_keeps_slowest_calls() -> None:
+    profiler = HookProfiler()
+    described: list[str] = []
+
+    def describe(site: str) -> str:
+        described.append(site)
+        return site
+
+    durations = [1.0, 2.0, 3.0, 4.0, 5.0, 0.5, 6.0]
+    for duration in durations:
+        profiler.record("hook", duration, partial(describe, f"main.py:{duration}"))
+
+    stats = profiler.hooks["hook"].as_dict("hook")
+    assert (stats["calls"], stats["total"], stats["max"]) == (7, sum(durations), 6.0)
+    assert len(stats["slowest"]) == SLOWEST_CALLS
+    assert stats["slowest"][0] == {"duration": 6.0, "site": "main.py:6.0"}
+    # Calls too fast to be among the slowest are never described
+    assert "main.py:0.5" not in described
+
+
+def test_wrap_getter_times_getter_and_hooks() -> None:
+    def get_method_hook(fullname: str) -> Callable[[Any], str] | None:
+        return str.upper if fullname == "myapp.models.Book.save" else None
+
+    profiler = HookProfiler(output_format="json")
+    getter = profiler.wrap_getter("method", get_method_hook)
+    assert getter("myapp.models.Book.delete") is None
+    hook = getter("myapp.models.Book.save")
+    assert hook is not None
+
+    assert hook("ctx") == "CTX"
+
+    data = json.loads(profiler.render([{"duration": 0.5}]))
+    assert data["django_context_initialization"]["duration"] == 0.5
+    rows = {row["hook"]: row for row in data["hooks"]}
+    assert {hook: row["calls"] for hook, row in rows.items()} == {"get_method_hook": 2, "method: str.upper": 1}
+    assert rows["method: str.upper"]["slowest"][0]["site"] == "?:-1"
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("1", "table"), ("table", "table"), ("JSON", "json"), ("0", None), ("", None)],
+)
+def test_profile_format_from_env(monkeypatch: pytest.MonkeyPatch, value: str, expected: str | None) -> None:
+    monkeypatch.setenv(PROFILE_ENV_VAR, value)
+    assert profile_format_from_env() == expected
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from mypy_django_plugin.lib.report import REPORT_ENV_VAR, PluginReport, find_plugin_caller, report_format_from_env
+
+
+def test_render_report() -> None:
+    report = PluginReport()
+    report.add_section("initialization", lambda: {"events": [{"phase": "apps", "duration": 0.12345}]})
+    report.add_section("empty", dict)
+
+    assert report.render() == "\n".join(
+        [
+            "django-stubs report:",
+            "  initialization:",
+            "    events:",
+            "      - phase=apps, duration=0.123",
+            "  empty:",
+            "    (nothing recorded)",
+        ]
+    )
+
+
+def test_find_plugin_caller_outside_plugin() -> None:
+    assert find_plugin_caller() == "unknown"
+
+
+def test_render_report_as_json() -> None:
+    report = PluginReport(output_format="json")
+    report.add_section("model_initializers", lambda: {"runs": 3, "skipped": 1})
+
+    assert json.loads(report.render()) == {"model_initializers": {"runs": 3, "skipped": 1}}
+
+
+@pytest.mark.parametrize(("value", "expected"), [("1", "text"), ("JSON", "json"), ("0", None), ("", None)])
+def test_report_format_from_env(monkeypatch: pytest.MonkeyPatch, value: str, expected: str | None) -> None:
+    monkeypatch.setenv(REPORT_ENV_VAR, value)
+    assert report_format_from_env() == expected
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from mypy.nodes import MDEF, Block, FuncDef, SymbolTableNode
+from mypy.types import AnyType, CallableType, Instance, TypeOfAny, TypeVarId, TypeVarType
+
+from mypy_django_plugin.lib import fullnames, helpers, roles
+
+if TYPE_CHECKING:
+    from mypy.nodes import TypeInfo
+    from mypy.types import Type as MypyType
+
+
+def make_class(fullname: str, *bases: TypeInfo) -> TypeInfo:
+    module, _, name = fullname.rpartition(".")
+    return helpers.create_type_info(name, module, [Instance(base, []) for base in bases])
+
+
+def test_roles_from_mro() -> None:
+    queryset = make_class(fullnames.QUERYSET_CLASS_FULLNAME)
+    manager = make_class(fullnames.MANAGER_CLASS_FULLNAME, make_class(fullnames.BASE_MANAGER_CLASS_FULLNAME))
+    custom = make_class("myapp.managers.CustomManager", manager, queryset)
+
+    class_roles = roles.compute_class_roles(custom)
+
+    assert class_roles == roles.BASE_MANAGER | roles.MANAGER | roles.QUERYSET
+    assert not class_roles & roles.MODEL
+
+
+def test_cache_invalidated_by_new_typeinfo_or_mro() -> None:
+    cache = roles.ClassRoleCache()
+    field = make_class(fullnames.FIELD_FULLNAME)
+    info = make_class("myapp.fields.MyField", field)
+
+    assert cache.get(info) == roles.FIELD
+    assert cache.get(info) == roles.FIELD
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Same class, processed again
+    replaced = make_class("myapp.fields.MyField")
+    assert cache.get(replaced) == 0
+
+    # Same class, once its bases got resolved
+    replaced.mro = [replaced, field]
+    assert cache.get(replaced) == roles.FIELD
+    assert cache.stats() == {"hits": 1, "misses": 3, "entries": 1, "annotated_methods": 0, "plain_methods": 0}
+
+
+def add_method(info: TypeInfo, name: str, ret_type: MypyType | None) -> None:
+    function = Instance(make_class("builtins.function"), [])
+    typ = CallableType([], [], [], ret_type, function) if ret_type is not None else None
+    method = FuncDef(name, [], Block([]), typ)
+    method.info = info
+    info.names[name] = SymbolTableNode(MDEF, method)
+
+
+def test_methods_that_may_return_annotations() -> None:
+    queryset = make_class(fullnames.QUERYSET_CLASS_FULLNAME)
+    custom = make_class("myapp.managers.CustomQuerySet", queryset)
+    any_type = AnyType(TypeOfAny.special_form)
+    self_type = TypeVarType("Self", "Self", TypeVarId(0), [], Instance(custom, []), any_type)
+    add_method(custom, "returns_self", self_type)
+    add_method(custom, "returns_generic", Instance(queryset, [self_type]))
+    add_method(custom, "returns_plain", Instance(custom, []))
+    add_method(custom, "unannotated", None)
+
+    cache = roles.ClassRoleCache()
+    assert cache.method_may_return_annotations(custom, "returns_self")
+    assert cache.method_may_return_annotations(custom, "returns_generic")
+    assert not cache.method_may_return_annotations(custom, "returns_plain")
+    assert not cache.method_may_return_annotations(custom, "unannotated")
+    # Methods not found on the class could return anything
+    assert cache.method_may_return_annotations(custom, "dynamic")
+    assert cache.method_may_return_annotations(custom, "returns_self")
+    assert cache.stats()["annotated_methods"] == 3
+    assert cache.stats()["plain_methods"] == 2
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from mypy_django_plugin.django import schema
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def make_schema(sources: dict[str, list[object]]) -> schema.ProjectSchema:
+    return {
+        "key": schema.schema_key("mysettings"),
+        "settings": {"INSTALLED_APPS": ["myapp"], "AUTH_USER_MODEL": "auth.User", "DEFAULT_AUTO_FIELD": "x"},
+        "setting_types": {"SECRET_KEY": ["builtins.str"]},
+        "models": {},
+        "relation_graph": {},
+        "sources": sources,
+    }
+
+
+def test_snapshot_roundtrip(tmp_path: Path) -> None:
+    source = tmp_path / "mysettings.py"
+    source.write_text("SECRET_KEY = '1'\n")
+    snapshot_path = str(tmp_path / "cache" / "mysettings.schema.json")
+    stored = make_schema({str(source): schema._fingerprint(str(source))})
+
+    schema.write_snapshot(snapshot_path, stored)
+
+    assert schema.load_snapshot(snapshot_path, "mysettings") == stored
+    # Snapshots are keyed by the settings module
+    assert schema.load_snapshot(snapshot_path, "othersettings") is None
+
+
+def test_snapshot_invalidated_by_source_change(tmp_path: Path) -> None:
+    source = tmp_path / "mysettings.py"
+    source.write_text("SECRET_KEY = '1'\n")
+    snapshot_path = str(tmp_path / "mysettings.schema.json")
+    schema.write_snapshot(snapshot_path, make_schema({str(source): schema._fingerprint(str(source))}))
+
+    # Touching a file without changing its contents keeps the snapshot
+    os.utime(source, ns=(0, 0))
+    assert schema.load_snapshot(snapshot_path, "mysettings") is not None
+
+    source.write_text("SECRET_KEY = '2'\n")
+    assert schema.load_snapshot(snapshot_path, "mysettings") is None
+
+
+def test_snapshot_invalidated_by_new_file(tmp_path: Path) -> None:
+    models_module = tmp_path / "models.py"
+    snapshot_path = str(tmp_path / "mysettings.schema.json")
+    schema.write_snapshot(snapshot_path, make_schema({str(models_module): schema._fingerprint(str(models_module))}))
+    assert schema.load_snapshot(snapshot_path, "mysettings") is not None
+
+    models_module.write_text("")
+    assert schema.load_snapshot(snapshot_path, "mysettings") is None
+
+
+def test_unreadable_snapshot(tmp_path: Path) -> None:
+    snapshot_path = tmp_path / "mysettings.schema.json"
+    assert schema.load_snapshot(str(snapshot_path), "mysettings") is None
+
+    snapshot_path.write_text("{not json")
+    assert schema.load_snapshot(str(snapshot_path), "mysettings") is None
+
+
+def make_model(module: str, name: str, related_models: list[str]) -> schema.ModelEntry:
+    return {
+        "module": module,
+        "name": name,
+        "label_lower": f"{module.partition('.')[0]}.{name.lower()}",
+        "abstract": False,
+        "auto_created": False,
+        "swapped": False,
+        "pk": "id",
+        "fields": [
+            {
+                "name": related_model.lower(),
+                "attname": None,
+                "field_class": "django.db.models.fields.related.ForeignKey",
+                "null": False,
+                "primary_key": False,
+                "related_model": related_model,
+            }
+            for related_model in related_models
+        ],
+        "relations": [],
+        "managers": {},
+    }
+
+
+def test_relation_graph_is_symmetric() -> None:
+    models = {
+        "shop.models.Order": make_model("shop.models", "Order", ["accounts.models.User", "shop.models.Item"]),
+        "shop.models.Item": make_model("shop.models", "Item", []),
+        "accounts.models.User": make_model("accounts.models", "User", []),
+        "blog.models.Post": make_model("blog.models", "Post", []),
+    }
+
+    assert schema.build_relation_graph(models) == {
+        "accounts.models": ["shop.models"],
+        "blog.models": [],
+        "shop.models": ["accounts.models"],
+    }
+
+
+def test_model_module_digest_ignores_unrelated_models() -> None:
+    models = {
+        "shop.models.Order": make_model("shop.models", "Order", ["accounts.models.User"]),
+        "accounts.models.User": make_model("accounts.models", "User", []),
+        "blog.models.Post": make_model("blog.models", "Post", []),
+    }
+    project_schema = make_schema({})
+    project_schema["models"] = models
+    project_schema["relation_graph"] = schema.build_relation_graph(models)
+
+    def shop_digest() -> str:
+        return schema.model_module_digest(project_schema, "shop.models", [models["shop.models.Order"]])
+
+    digest = shop_digest()
+    models["blog.models.Post"]["pk"] = "uuid"
+    assert shop_digest() == digest
+
+    models["accounts.models.User"]["pk"] = "uuid"
+    assert shop_digest() != digest
+
+
+def test_describe_value_type() -> None:
+    assert schema.describe_value_type("x") == ["builtins.str"]
+    assert schema.describe_value_type(None) == [schema.NONE_TYPE]
+    assert schema.describe_value_type(["a", "b"]) == ["builtins.list", ["builtins.str"]]
+    assert schema.describe_value_type(("a", 1)) == ["builtins.tuple", [schema.ANY_TYPE]]
+    assert schema.describe_value_type([]) == ["builtins.list", [schema.ANY_TYPE]]
+    assert schema.describe_value_type({"default": {"NAME": "db"}}) == [
+        "builtins.dict",
+        ["builtins.str"],
+        ["builtins.dict", ["builtins.str"], ["builtins.str"]],
+    ]
+    # Only builtin types are described
+    assert schema.describe_value_type(os.sep.join) == [schema.ANY_TYPE]
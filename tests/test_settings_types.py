@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from mypy_django_plugin.django import schema
+from mypy_django_plugin.django.settings_types import render_stub, render_type
+
+
+def test_render_type() -> None:
+    assert render_type(schema.describe_value_type(None)) == "None"
+    assert render_type(schema.describe_value_type(("a", "b"))) == "tuple[str, ...]"
+    assert render_type(schema.describe_value_type({"default": {"NAME": 1}})) == "dict[str, dict[str, int]]"
+    assert render_type(schema.describe_value_type([object()])) == "list[Any]"
+
+
+def test_render_stub() -> None:
+    setting_types = {
+        "TIMEOUT": schema.describe_value_type(30),
+        "DEBUG": schema.describe_value_type(True),
+        "OPTIONS": schema.describe_value_type({"retries": 3, "backend": "redis"}),
+    }
+
+    assert render_stub("mysettings", setting_types, skip={"DEBUG"}) == (
+        "# Generated by `python -m mypy_django_plugin.django.settings_types mysettings`\n"
+        "\n"
+        "from typing import Any\n"
+        "\n"
+        "OPTIONS: dict[str, Any]\n"
+        "TIMEOUT: int\n"
+    )
+    # `Any` is only imported when used
+    assert render_stub("mysettings", setting_types, skip={"OPTIONS"}) == (
+        "# Generated by `python -m mypy_django_plugin.django.settings_types mysettings`\n\nDEBUG: bool\nTIMEOUT: int\n"
+    )